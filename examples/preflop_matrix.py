@@ -0,0 +1,18 @@
+import sys
+sys.path.append('../pokerlib')
+
+from os import cpu_count
+from pokerlib import PreflopMatrix, generatePreflopMatrix
+from pokerlib.enums import Rank, Suit
+
+# usage: python examples/preflop_matrix.py preflop.bin [generate]
+# generating the matrix enumerates 47008 matchups and takes hours
+path = sys.argv[1]
+if len(sys.argv) > 2 and sys.argv[2] == 'generate':
+    generatePreflopMatrix(path, workers=cpu_count())
+
+with PreflopMatrix(path) as matrix:
+    print(matrix.equity(
+        [(Rank.ACE, Suit.HEART), (Rank.ACE, Suit.DIAMOND)],
+        [(Rank.KING, Suit.SPADE), (Rank.KING, Suit.CLUB)]
+    ))
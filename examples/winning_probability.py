@@ -1,32 +1,25 @@
 import sys
 sys.path.append('../pokerlib')
 
-from random import sample
-from itertools import product
-from pokerlib import HandParser
+from pokerlib import equity
 from pokerlib.enums import Rank, Suit
 
-def winningProbability(players_cards, board=[], n=1000):
-    cards = list(product(Rank, Suit))
-    for card in board: cards.remove(card)
-    for player_cards in players_cards:
-        for card in player_cards:
-            cards.remove(card)
-
-    wins = [0] * len(players_cards)
-    for i in range(n):
-        board_ = sample(cards, 5-len(board))
-        hands = [
-            HandParser(player_cards + board + board_)
-            for player_cards in players_cards
-        ]
-        winner = max(hands)
-        for i, hand in enumerate(hands):
-            if hand == winner: wins[i] += 1
-
-    return [win / n for win in wins]
-
-w1, w2 = winningProbability([
+# the flop is known, so all of the turn and river cards are enumerated
+w1, w2 = equity([
     [(Rank.ACE, Suit.HEART), (Rank.KING, Suit.HEART)],
     [(Rank.KING, Suit.SPADE), (Rank.KING, Suit.DIAMOND)]
-])
\ No newline at end of file
+], board=[
+    (Rank.TWO, Suit.HEART),
+    (Rank.SEVEN, Suit.HEART),
+    (Rank.KING, Suit.CLUB)
+])
+print(w1)
+print(w2)
+
+# preflop with three players is estimated from sampled boards
+w1, w2, w3 = equity([
+    [(Rank.ACE, Suit.HEART), (Rank.KING, Suit.HEART)],
+    [(Rank.KING, Suit.SPADE), (Rank.KING, Suit.DIAMOND)],
+    [(Rank.SEVEN, Suit.CLUB), (Rank.EIGHT, Suit.CLUB)]
+], samples=10000, seed=0)
+print(w1.equity, w2.equity, w3.equity)
@@ -2,8 +2,14 @@
 
 from . import enums
 from ._handparser import HandParser, HandParserGroup
+from ._lookup import LookupHandParser, evaluateShared
+from ._cache import HandCache, CachedHandParser
+from ._bitmask import BitmaskHandParser
+from ._equity import equity
+from ._range import parseRange, rangeEquity
+from ._preflop import PreflopMatrix, generatePreflopMatrix
 from ._player import Player, PlayerGroup, PlayerSeats
-from ._round import Round
+from ._round import Round, outMask
 from ._table import Table
 
 __title__ = 'pokerlib'
@@ -16,9 +22,20 @@ __email__ = 'nseverkar@gmail.com'
 __all__ = [
     'HandParser',
     'HandParserGroup',
+    'LookupHandParser',
+    'HandCache',
+    'CachedHandParser',
+    'BitmaskHandParser',
+    'evaluateShared',
     'Player',
     'PlayerGroup',
     'Round',
+    'outMask',
     'Table',
-    'PlayerSeats'
+    'PlayerSeats',
+    'equity',
+    'parseRange',
+    'rangeEquity',
+    'PreflopMatrix',
+    'generatePreflopMatrix'
 ]
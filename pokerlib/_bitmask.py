@@ -0,0 +1,206 @@
+from .enums import Hand
+from ._handparser import (
+    HandParser, STRAIGHT_TOPS, handStrength, reactiveParse
+)
+
+def _topBits(mask):
+    bits = []
+    while mask and len(bits) < 5:
+        bits.append(mask.bit_length() - 1)
+        mask &= ~(1 << bits[-1])
+    return tuple(bits)
+
+# positions of the (up to) five highest set bits of each 13-bit mask,
+# from the highest down, used for ranks as well as card indices
+TOP_BITS = [_topBits(mask) for mask in range(1 << 13)]
+
+
+def _straightRanks(top):
+    return [(top - i) % 13 for i in range(5)]
+
+
+class BitmaskHandParser(HandParser):
+    """
+    HandParser that decides hands with rank and suit bit masks and small
+    tables. Strength is computed from the masks alone, while handbase
+    and kickers, the same as HandParser's, are only indexed on demand.
+    """
+    __slots__ = ["_indexed"]
+
+    def __init__(self, cards: list):
+        super().__init__(cards)
+        self._indexed = False
+
+    def __repr__(self):
+        return f"BitmaskHandParser({self.cards})"
+
+    @property
+    @reactiveParse
+    def handbase(self):
+        if not self._indexed: self._setIndices()
+        return self._handbase
+
+    @property
+    @reactiveParse
+    def kickers(self):
+        if not self._indexed: self._setIndices()
+        return self._kickers
+
+    @staticmethod
+    def evaluateShared(board, holes):
+        """Strengths of hole cards sharing the board, without lookup tables"""
+        return [
+            BitmaskHandParser(list(hole) + list(board)).strength
+            for hole in holes
+        ]
+
+    def _suitCards(self, suit):
+        # rank mask of the suit's cards and their indices by rank
+        indices, suitmask = [0] * 13, 0
+        for i, (rank, cardsuit) in enumerate(self.cards):
+            if cardsuit == suit:
+                indices[rank] = i
+                suitmask |= 1 << rank
+        return suitmask, indices
+
+    def _setHand(self):
+        ranknums, pairnums = self._ranknums, self._pairnums
+        straighttop = STRAIGHT_TOPS[self._rankmask]
+        flushsuit = self._flushsuit
+
+        if flushsuit is not None:
+            suitmask, indices = self._suitCards(flushsuit)
+            if straighttop is not None:
+                suitedtop = STRAIGHT_TOPS[suitmask]
+                if suitedtop is not None:
+                    self._handenum = Hand.STRAIGHTFLUSH
+                    self._handbase = [
+                        indices[(suitedtop - i) % 13] for i in range(5)]
+                    return
+
+        # ranks of equal cards are chosen the same way as in HandParser,
+        # the lowest quads and trips, the highest pairs
+        if pairnums[4]:
+            self._handenum = Hand.FOUROFAKIND
+            last = sum(ranknums[:ranknums.index(4)]) + 3
+            self._handbase = [last, last-1, last-2, last-3]
+
+        elif pairnums[3] == 2 or pairnums[3] == 1 and pairnums[2] >= 1:
+            self._handenum = Hand.FULLHOUSE
+            threes = 12 - ranknums[::-1].index(3)
+            twos = next(
+                rank for rank in reversed(range(13))
+                if ranknums[rank] >= 2 and rank != threes
+            )
+            threes, twos = sum(ranknums[:threes]), sum(ranknums[:twos])
+            self._handbase = [threes, threes+1, threes+2, twos, twos+1]
+
+        elif flushsuit is not None:
+            self._handenum = Hand.FLUSH
+            self._handbase = [indices[rank] for rank in TOP_BITS[suitmask]]
+
+        elif straighttop is not None:
+            self._handenum = Hand.STRAIGHT
+            self._handbase = self._getStraightIndicesFromTop(straighttop)
+
+        elif pairnums[3]:
+            self._handenum = Hand.THREEOFAKIND
+            last = sum(ranknums[:ranknums.index(3)]) + 2
+            self._handbase = [last, last-1, last-2]
+
+        elif pairnums[2] >= 2:
+            self._handenum = Hand.TWOPAIR
+            reverse = ranknums[::-1]
+            high = reverse.index(2)
+            first, second = 12 - high, 12 - reverse.index(2, high + 1)
+            first, second = sum(ranknums[:first]), sum(ranknums[:second])
+            self._handbase = [first+1, first, second+1, second]
+
+        elif pairnums[2]:
+            self._handenum = Hand.ONEPAIR
+            first = sum(ranknums[:ranknums.index(2)])
+            self._handbase = [first+1, first]
+
+        elif self.ncards:
+            self._handenum = Hand.HIGHCARD
+            self._handbase = [self.ncards - 1]
+
+    def _setKickers(self):
+        if self.ncards > 13: return super()._setKickers()
+        nkickers = 5 - len(self._handbase)
+        indexmask = (1 << self.ncards) - 1
+        for i in self._handbase: indexmask ^= 1 << i
+        self._kickers = list(TOP_BITS[indexmask][:nkickers])
+
+    def _setIndices(self):
+        self._setHand()
+        self._setKickers()
+        self._indexed = True
+
+    def _maskRanks(self):
+        # hand enum and ranks deciding the hand, from the masks alone
+        ranknums, pairnums = self._ranknums, self._pairnums
+        rankmask, flushsuit = self._rankmask, self._flushsuit
+        straighttop = STRAIGHT_TOPS[rankmask]
+
+        if flushsuit is not None:
+            suitmask = 0
+            for rank, suit in self.cards:
+                if suit == flushsuit: suitmask |= 1 << rank
+            suitedtop = STRAIGHT_TOPS[suitmask]
+            if straighttop is not None and suitedtop is not None:
+                return Hand.STRAIGHTFLUSH, _straightRanks(suitedtop)
+
+        if pairnums[4]:
+            quads = ranknums.index(4)
+            kicker = TOP_BITS[rankmask ^ 1 << quads][:1]
+            return Hand.FOUROFAKIND, [quads] * 4 + list(kicker)
+
+        if pairnums[3] == 2 or pairnums[3] == 1 and pairnums[2] >= 1:
+            threes = 12 - ranknums[::-1].index(3)
+            twos = next(
+                rank for rank in reversed(range(13))
+                if ranknums[rank] >= 2 and rank != threes
+            )
+            return Hand.FULLHOUSE, [threes] * 3 + [twos] * 2
+
+        if flushsuit is not None:
+            return Hand.FLUSH, TOP_BITS[suitmask]
+
+        if straighttop is not None:
+            return Hand.STRAIGHT, _straightRanks(straighttop)
+
+        if pairnums[3]:
+            threes = ranknums.index(3)
+            kickers = TOP_BITS[rankmask ^ 1 << threes][:2]
+            return Hand.THREEOFAKIND, [threes] * 3 + list(kickers)
+
+        if pairnums[2] >= 2:
+            reverse = ranknums[::-1]
+            high = reverse.index(2)
+            first, second = 12 - high, 12 - reverse.index(2, high + 1)
+            kicker = TOP_BITS[rankmask ^ 1 << first ^ 1 << second][:1]
+            return Hand.TWOPAIR, [first, first, second, second] + list(kicker)
+
+        if pairnums[2]:
+            pair = ranknums.index(2)
+            kickers = TOP_BITS[rankmask ^ 1 << pair][:3]
+            return Hand.ONEPAIR, [pair, pair] + list(kickers)
+
+        if self.ncards:
+            return Hand.HIGHCARD, TOP_BITS[rankmask]
+
+        return None, None
+
+    def parse(self):
+        # with more than 7 cards, kickers can repeat ranks,
+        # so strength is taken from the indexed hand
+        if self.ncards > 7:
+            super().parse()
+            self._indexed = True
+            return
+        self._handenum, ranks = self._maskRanks()
+        self._strength = -1 if ranks is None \
+            else handStrength(self._handenum, ranks)
+        self._indexed = False
+        self._parsed = True
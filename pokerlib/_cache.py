@@ -0,0 +1,110 @@
+from collections import OrderedDict, namedtuple
+
+from ._handparser import HandParser
+from .cards import suitRelabeling
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class HandCache:
+    """Bounded least recently used cache, with hit and miss counts"""
+
+    def __init__(self, maxsize=1 << 16):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+class CachedHandParser(HandParser):
+    """
+    HandParser that reuses the parse of any hand differing from it only
+    by a suit permutation, as stored in the shared cache attribute.
+    On a cache hit, handbase and kickers are recovered on demand.
+    """
+    __slots__ = ["_cached"]
+    cache = HandCache()
+
+    def __init__(self, cards: list):
+        super().__init__(cards)
+        self._cached = None
+
+    def __repr__(self):
+        return f"CachedHandParser({self.cards})"
+
+    @property
+    def handbase(self):
+        # a parse can hit the cache, so it runs before the check
+        if not self._parsed: self.parse()
+        if self._cached is not None: self._restoreIndices()
+        return super().handbase
+
+    @property
+    def kickers(self):
+        if not self._parsed: self.parse()
+        if self._cached is not None: self._restoreIndices()
+        return super().kickers
+
+    def _addCards(self, cards):
+        super()._addCards(cards)
+        self._cached = None
+
+    def _relabeling(self):
+        return suitRelabeling([rank << 2 | suit for rank, suit in self.cards])
+
+    def _restoreIndices(self):
+        # cached cards are given as (rank, canonical suit) pairs
+        _, _, handbase, kickers = self._cached
+        self._cached = None
+        suits = [0] * 4
+        for suit, canonical in enumerate(self._relabeling()):
+            suits[canonical] = suit
+        index = {(rank, suit): i for i, (rank, suit) in enumerate(self.cards)}
+        self._handbase = [index[rank, suits[suit]] for rank, suit in handbase]
+        self._kickers = [index[rank, suits[suit]] for rank, suit in kickers]
+
+    def parse(self):
+        # the ranks held in each suit, in sorted order, are the same
+        # for all hands that differ only by a suit permutation
+        suitmasks = [0] * 4
+        for rank, suit in self.cards: suitmasks[suit] |= 1 << rank
+        key = tuple(sorted(suitmasks))
+
+        entry = self.cache.get(key)
+        if entry is None:
+            super().parse()
+            relabeling = self._relabeling()
+            cards = [(rank, relabeling[suit]) for rank, suit in self.cards]
+            self.cache.put(key, (
+                self._strength, self._handenum,
+                [cards[i] for i in self._handbase],
+                [cards[i] for i in self._kickers]
+            ))
+        else:
+            self._strength, self._handenum = entry[0], entry[1]
+            self._cached = entry
+            self._parsed = True
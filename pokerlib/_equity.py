@@ -0,0 +1,148 @@
+from math import comb
+from random import Random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from . import _lookup
+from ._lookup import KEYSTART, COMPACT_KEYS, sharedStrengths
+from .cards import DECK, compactCards
+
+Equity = namedtuple('Equity', ['win', 'tie', 'loss', 'equity'])
+
+# sampled boards are split into chunks of this size, each sampled with
+# its own random generator seeded by the chunk's index, so results do
+# not depend on how the chunks are distributed among workers
+SAMPLE_CHUNK = 10000
+
+
+class EquityCounter:
+    """Showdown outcome counts of players sharing the same boards"""
+
+    def __init__(self, holes):
+        if _lookup._rank_table is None: _lookup._buildTables()
+        self.holes = holes
+        self.hole_keys = [sum(map(COMPACT_KEYS.__getitem__, hole))
+                          for hole in holes]
+        self.nboards = 0
+        self.wins = [0] * len(holes)
+        # splits[i][k] counts the boards where player i splits with k others
+        self.splits = [[0] * len(holes) for _ in holes]
+
+    def count(self, board, board_key):
+        """Count the showdown on a board with the given summed key"""
+        strengths = sharedStrengths(board, board_key, self.holes, self.hole_keys)
+        best, winners = -1, []
+        for i, strength in enumerate(strengths):
+            if strength > best:
+                best, winners = strength, [i]
+            elif strength == best:
+                winners.append(i)
+
+        self.nboards += 1
+        if len(winners) == 1:
+            self.wins[winners[0]] += 1
+        else:
+            for i in winners:
+                self.splits[i][len(winners) - 1] += 1
+
+    def merge(self, other):
+        self.nboards += other.nboards
+        for i in range(len(self.holes)):
+            self.wins[i] += other.wins[i]
+            for k, n in enumerate(other.splits[i]):
+                self.splits[i][k] += n
+
+    def results(self):
+        results = []
+        for wins, splits in zip(self.wins, self.splits):
+            ties = sum(splits)
+            shares = wins + sum(n / (k + 1) for k, n in enumerate(splits))
+            results.append(Equity(
+                wins / self.nboards,
+                ties / self.nboards,
+                (self.nboards - wins - ties) / self.nboards,
+                shares / self.nboards
+            ))
+        return results
+
+
+def _remainingDeck(holes, board, dead):
+    used = [card for hole in holes for card in hole] + board + dead
+    if len(set(used)) != len(used):
+        raise ValueError('cards should not repeat')
+    used = set(used)
+    return [card for card in DECK if card not in used]
+
+def enumerateBoards(counter, board, deck):
+    """Counts showdowns on every completion of the board"""
+    board = list(board)
+    board_key = KEYSTART + sum(map(COMPACT_KEYS.__getitem__, board))
+
+    # partial board keys are shared by all of their completions
+    def complete(start, key):
+        if len(board) == 5:
+            return counter.count(board, key)
+        for i in range(start, len(deck) - (4 - len(board))):
+            board.append(deck[i])
+            complete(i + 1, key + COMPACT_KEYS[deck[i]])
+            board.pop()
+
+    complete(0, board_key)
+
+def sampleBoards(counter, board, deck, samples, rng):
+    """Counts showdowns on randomly sampled completions of the board"""
+    nmissing = 5 - len(board)
+    board_key = KEYSTART + sum(map(COMPACT_KEYS.__getitem__, board))
+    for _ in range(samples):
+        completion = rng.sample(deck, nmissing)
+        key = board_key + sum(map(COMPACT_KEYS.__getitem__, completion))
+        counter.count(board + completion, key)
+
+def _sampleChunk(holes, board, deck, samples, seed):
+    counter = EquityCounter(holes)
+    sampleBoards(counter, board, deck, samples, Random(seed))
+    return counter
+
+def parallelSampleBoards(counter, board, deck, samples, seed, workers):
+    """Counts showdowns on sampled boards, using a pool of processes"""
+    sizes = [
+        min(SAMPLE_CHUNK, samples - start)
+        for start in range(0, samples, SAMPLE_CHUNK)
+    ]
+    seeds = [f'{seed}:{i}' for i in range(len(sizes))]
+    n = len(sizes)
+    args = ([counter.holes] * n, [board] * n, [deck] * n, sizes, seeds)
+
+    if workers == 1:
+        for chunk_counter in map(_sampleChunk, *args):
+            counter.merge(chunk_counter)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        for chunk_counter in pool.map(_sampleChunk, *args):
+            counter.merge(chunk_counter)
+
+def equity(
+    holes, board=(), dead=(),
+    max_evaluations=4000000, samples=100000, seed=None, workers=1
+):
+    """
+    Win, tie and loss shares and the equity of each player's hole cards.
+    All board completions are enumerated if that takes at most
+    max_evaluations hand evaluations, otherwise the given number of
+    boards is randomly sampled. Sampling can be spread over workers
+    processes (None uses all cores), for a given seed the result
+    does not depend on the number of workers.
+    """
+    holes = [compactCards(hole) for hole in holes]
+    board, dead = compactCards(board), compactCards(dead)
+    deck = _remainingDeck(holes, board, dead)
+
+    counter = EquityCounter(holes)
+    nboards = comb(len(deck), 5 - len(board))
+    if nboards * len(holes) <= max_evaluations:
+        enumerateBoards(counter, board, deck)
+    else:
+        if seed is None: seed = Random().getrandbits(64)
+        parallelSampleBoards(counter, board, deck, samples, seed, workers)
+
+    return counter.results()
@@ -1,5 +1,52 @@
 from bisect import insort
-from .enums import Hand, Suit
+from .enums import Hand, Rank, Suit
+from .cards import CARD_TUPLES
+
+# A hand strength is a single integer. The top bits hold the Hand
+# enum, below them are the ranks of the (up to) five cards that decide
+# the hand - handbase ranks followed by kicker ranks - one nibble each.
+# This mirrors the order of hands, so hands are compared by comparing
+# their strengths.
+HANDSHIFT = 20
+
+def handStrength(handenum, ranks):
+    strength = handenum
+    for i in range(5):
+        strength <<= 4
+        if i < len(ranks): strength |= ranks[i]
+    return strength
+
+def _straightTop(rankmask):
+    # ace can also play as the lowest card
+    mask = rankmask << 1 | rankmask >> 12 & 1
+    for top in reversed(range(4, 14)):
+        window = 0b11111 << (top - 4)
+        if mask & window == window:
+            return top - 1
+
+# number of handbase ranks leading each hand's strength,
+# the remaining ones of the five are kicker ranks
+HANDBASE_SIZES = {
+    Hand.HIGHCARD: 1, Hand.ONEPAIR: 2, Hand.TWOPAIR: 4,
+    Hand.THREEOFAKIND: 3, Hand.STRAIGHT: 5, Hand.FLUSH: 5,
+    Hand.FULLHOUSE: 5, Hand.FOUROFAKIND: 4, Hand.STRAIGHTFLUSH: 5
+}
+
+def strengthsKicker(strengths):
+    """
+    Group kicker of hands with the given strengths, read from the
+    strengths' kicker ranks the same as HandParserGroup.getGroupKicker
+    """
+    best = max(strengths)
+    handenum = best >> HANDSHIFT
+    strengths = [s for s in strengths if s >> HANDSHIFT == handenum]
+    for shift in reversed(range(0, 20 - 4 * HANDBASE_SIZES[handenum], 4)):
+        best_rank = best >> shift & 0xf
+        for strength in strengths:
+            if strength >> shift & 0xf < best_rank: return Rank(best_rank)
+
+# the highest straight's top rank for each 13-bit rank mask
+STRAIGHT_TOPS = [_straightTop(rankmask) for rankmask in range(1 << 13)]
 
 def reactiveParse(fun):
     def modfun(self, *args, **kwargs):
@@ -13,8 +60,9 @@ class HandParser:
     __slots__ = [
         "original", "ncards", "cards",
         "_handenum", "_handbase", "_kickers",
-        "_parsed",
+        "_strength", "_parsed",
         "_ranknums", "_suitnums",
+        "_rankmask", "_pairnums",
         "_flushsuit", "_straightindices"
     ]
 
@@ -23,23 +71,24 @@ class HandParser:
 
         self.original = cards
         self.ncards = len(cards)
+        # compact cards are parsed in their (rank, suit) form
+        if cards and type(cards[0]) is int:
+            cards = [CARD_TUPLES[card] for card in cards]
         self.cards = sorted(cards, key = lambda x: x[0])
 
         self._handenum = None
         self._handbase = []
         self._kickers = []
+        self._strength = None
 
+        # running card statistics, which are updated as cards are
+        # added, so that each street's parse does not recount the hand
         self._ranknums = [0] * 13
         self._suitnums = [0] * 4
-        for rank, suit in cards:
-            self._ranknums[rank] += 1
-            self._suitnums[suit] += 1
-
+        self._rankmask = 0
+        self._pairnums = [13, 0, 0, 0, 0]
         self._flushsuit = None
-        for suit in Suit:
-            if self._suitnums[suit] >= 5:
-                self._flushsuit = suit
-                break
+        self._countCards(cards)
 
         self._straightindices = None
 
@@ -58,6 +107,11 @@ class HandParser:
     def kickers(self):
         return self._kickers
 
+    @property
+    @reactiveParse
+    def strength(self):
+        return self._strength
+
     @property
     def handbasecards(self):
         return map(
@@ -84,33 +138,22 @@ class HandParser:
         return f"HandParser({self.cards})"
 
     def __eq__(self, other):
-        if self.handenum != other.handenum: return False
-        for (s_val, _), (o_val, _) in zip(self.handfullcards,
-                                          other.handfullcards):
-            if s_val != o_val: return False
-        return True
+        return self.strength == other.strength
 
     def __gt__(self, other):
-        if self.handenum != other.handenum:
-            return self.handenum > other.handenum
-        for (s_val, _), (o_val, _) in zip(self.handfullcards,
-                                          other.handfullcards):
-            if s_val != o_val: return s_val > o_val
-        return False
+        return self.strength > other.strength
 
     def __lt__(self, other):
-        if self.handenum != other.handenum:
-            return self.handenum < other.handenum
-        for (s_val, _), (o_val, _) in zip(self.handfullcards,
-                                          other.handfullcards):
-            if s_val != o_val: return s_val < o_val
-        return False
+        return self.strength < other.strength
 
     def __ge__(self, other):
-        return not self < other
+        return self.strength >= other.strength
 
     def __le__(self, other):
-        return not other > self
+        return self.strength <= other.strength
+
+    def __hash__(self):
+        return hash(self.strength)
 
     def __iadd__(self, cards):
         if len(cards) > 0:
@@ -121,20 +164,28 @@ class HandParser:
         self._parsed = False
         self.original.extend(cards)
         self.ncards += len(cards)
+        if type(cards[0]) is int:
+            cards = [CARD_TUPLES[card] for card in cards]
         for card in cards: insort(self.cards, card)
 
         self._handenum = None
         self._handbase.clear()
         self._kickers.clear()
+        self._strength = None
 
-        for rank, suit in cards:
-            self._ranknums[rank] += 1
-            self._suitnums[suit] += 1
+        self._countCards(cards)
 
-        for suit in Suit:
-            if self._suitnums[suit] >= 5:
-                self._flushsuit = suit
-                break
+    def _countCards(self, cards):
+        ranknums, suitnums = self._ranknums, self._suitnums
+        pairnums = self._pairnums
+        for rank, suit in cards:
+            pairnums[ranknums[rank]] -= 1
+            ranknums[rank] += 1
+            pairnums[ranknums[rank]] += 1
+            self._rankmask |= 1 << rank
+            suitnums[suit] += 1
+            if suitnums[suit] >= 5 and self._flushsuit is None:
+                self._flushsuit = Suit(suit)
 
     @staticmethod
     def _getStraightIndices(valnums):
@@ -153,6 +204,18 @@ class HandParser:
                     return straightindices
             else: straightlen = 1
 
+    def _getStraightIndicesFromTop(self, top):
+        # index of the first card of each rank, same as _getStraightIndices
+        firstindices, index = [0] * 13, 0
+        for rank, num in enumerate(self._ranknums):
+            firstindices[rank] = index
+            index += num
+        if top == 3: return [
+            firstindices[3], firstindices[2], firstindices[1],
+            firstindices[0], self.ncards - 1
+        ]
+        return [firstindices[top - i] for i in range(5)]
+
     def _setStraightFlush(self):
         counter = 0
         suited_vals, permut = [0] * 13, [0] * len(self.cards)
@@ -248,11 +311,11 @@ class HandParser:
         self._handbase = [self.ncards - 1]
 
     def _setHand(self):
-        self._straightindices = self._getStraightIndices(
-            self._ranknums)
+        straighttop = STRAIGHT_TOPS[self._rankmask]
+        self._straightindices = None if straighttop is None \
+            else self._getStraightIndicesFromTop(straighttop)
 
-        pairnums = [0] * 5
-        for num in self._ranknums: pairnums[num] += 1
+        pairnums = self._pairnums
 
         if self._straightindices is not None \
             and self._flushsuit is not None \
@@ -285,12 +348,21 @@ class HandParser:
             if not inhand[i]: self._kickers.append(i)
             i -= 1
 
+    def _setStrength(self):
+        if self._handenum is None:
+            self._strength = -1
+            return
+        cards = self.cards
+        self._strength = handStrength(self._handenum, [
+            cards[i][0] for i in self._handbase + self._kickers])
+
     # with introduction of reactive parsing, this method should
     # be treated privately, but renaming parse to _parse would
     # change the class interface
     def parse(self):
         self._setHand()
         self._setKickers()
+        self._setStrength()
         self._parsed = True
 
 
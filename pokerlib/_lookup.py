@@ -0,0 +1,244 @@
+from .enums import Hand
+from .cards import compactCards
+from ._handparser import (
+    HandParser, HANDSHIFT, STRAIGHT_TOPS, handStrength
+)
+
+# rank multisets are hashed by adding 5^rank for every card, since
+# no rank can appear more than four times the key is collision-free
+RANK_KEYS = [5 ** rank for rank in range(13)]
+
+# above the rank key every card also increments its suit counter,
+# counters start at 3, so a counter's top bit is set exactly when
+# its suit is represented by five cards or more
+SUITSHIFT = 40
+RANKBITS = (1 << SUITSHIFT) - 1
+FLUSHBITS = 0x8888 << SUITSHIFT
+KEYSTART = 0x3333 << SUITSHIFT
+CARD_KEYS = [
+    [RANK_KEYS[rank] + (1 << 4 * suit + SUITSHIFT) for suit in range(4)]
+    for rank in range(13)
+]
+COMPACT_KEYS = [CARD_KEYS[card >> 2][card & 3] for card in range(52)]
+
+_rank_table = None
+_flush_table = None
+
+def strengthHand(strength):
+    return Hand(strength >> HANDSHIFT)
+
+def _straightRanks(top):
+    return [(top - i) % 13 for i in range(5)]
+
+def _rankStrength(ranks, straight):
+    # ranks are sorted descendingly, straight is the top straight rank
+    groups = sorted(
+        ((ranks.count(rank), rank) for rank in set(ranks)),
+        reverse = True
+    )
+    (count0, rank0), (count1, rank1) = (groups + [(0, 0)] * 2)[:2]
+
+    if count0 == 4:
+        handenum, base = Hand.FOUROFAKIND, [rank0] * 4
+    elif count0 == 3 and count1 >= 2:
+        pair = max(rank for count, rank in groups[1:] if count >= 2)
+        handenum, base = Hand.FULLHOUSE, [rank0] * 3 + [pair] * 2
+    elif straight is not None:
+        return handStrength(Hand.STRAIGHT, _straightRanks(straight))
+    elif count0 == 3:
+        handenum, base = Hand.THREEOFAKIND, [rank0] * 3
+    elif count0 == 2 and count1 == 2:
+        handenum, base = Hand.TWOPAIR, [rank0] * 2 + [rank1] * 2
+    elif count0 == 2:
+        handenum, base = Hand.ONEPAIR, [rank0] * 2
+    elif count0 == 1:
+        handenum, base = Hand.HIGHCARD, [rank0]
+    else: return 0
+
+    kickers = list(ranks)
+    for rank in base: kickers.remove(rank)
+    return handStrength(handenum, base + kickers[:5 - len(base)])
+
+def _flushStrength(suitmask, straight):
+    if straight is not None:
+        return handStrength(Hand.STRAIGHTFLUSH, _straightRanks(straight))
+    ranks = [rank for rank in reversed(range(13)) if suitmask >> rank & 1]
+    return handStrength(Hand.FLUSH, ranks[:5])
+
+def _buildTables():
+    global _rank_table, _flush_table
+
+    rank_table = {}
+    def fill(rank, ranks, rankmask, key):
+        if rank < 0:
+            rank_table[key] = _rankStrength(ranks, STRAIGHT_TOPS[rankmask])
+            return
+        fill(rank - 1, ranks, rankmask, key)
+        for count in range(1, min(4, 7 - len(ranks)) + 1):
+            fill(rank - 1, ranks + [rank] * count, rankmask | 1 << rank,
+                 key + count * RANK_KEYS[rank])
+    fill(12, [], 0, 0)
+
+    flush_table = [0] * (1 << 13)
+    for suitmask in range(1 << 13):
+        if suitmask.bit_count() >= 5:
+            flush_table[suitmask] = _flushStrength(
+                suitmask, STRAIGHT_TOPS[suitmask])
+
+    _rank_table, _flush_table = rank_table, flush_table
+
+def flushStrength(flushbits, cards):
+    """Strength of compact cards, whose key has the given flush bits"""
+    flushsuit = flushbits.bit_length() - SUITSHIFT - 4 >> 2
+    suitmask = 0
+    for card in cards:
+        if card & 3 == flushsuit: suitmask |= 1 << (card >> 2)
+    return _flush_table[suitmask]
+
+def evaluate(cards):
+    """Strength of a hand with at most 7 (rank, suit) or compact cards"""
+    if _rank_table is None: _buildTables()
+
+    if len(cards) > 0 and type(cards[0]) is int:
+        key = KEYSTART
+        for card in cards:
+            key += COMPACT_KEYS[card]
+        flushbits = key & FLUSHBITS
+        if flushbits: return flushStrength(flushbits, cards)
+        return _rank_table[key & RANKBITS]
+
+    key = KEYSTART
+    for rank, suit in cards:
+        key += CARD_KEYS[rank][suit]
+
+    flushbits = key & FLUSHBITS
+    if flushbits:
+        flushsuit = flushbits.bit_length() - SUITSHIFT - 4 >> 2
+        suitmask = 0
+        for rank, suit in cards:
+            if suit == flushsuit: suitmask |= 1 << rank
+        return _flush_table[suitmask]
+
+    return _rank_table[key & RANKBITS]
+
+
+def sharedStrengths(board, board_key, holes, hole_keys):
+    """
+    Strengths of compact hole cards sharing the board, given the board's
+    summed key and the summed keys of the hole cards
+    """
+    rank_table = _rank_table
+    strengths = []
+    for hole, hole_key in zip(holes, hole_keys):
+        key = board_key + hole_key
+        flushbits = key & FLUSHBITS
+        if flushbits:
+            strengths.append(flushStrength(flushbits, hole + board))
+        else: strengths.append(rank_table[key & RANKBITS])
+    return strengths
+
+def evaluateShared(board, holes):
+    """
+    Strengths of each player's hole cards combined with the shared board,
+    whose key is summed only once, with at most 7 cards per player
+    """
+    if _rank_table is None: _buildTables()
+    board = compactCards(board)
+    holes = [compactCards(hole) for hole in holes]
+    board_key = KEYSTART
+    for card in board: board_key += COMPACT_KEYS[card]
+    hole_keys = [sum(map(COMPACT_KEYS.__getitem__, hole)) for hole in holes]
+    return sharedStrengths(board, board_key, holes, hole_keys)
+
+
+class LookupHandParser:
+    """HandParser interface backed by precomputed strength tables"""
+    __slots__ = ["original", "ncards", "_strength", "_parser"]
+
+    def __init__(self, cards: list):
+        self.original = cards
+        self.ncards = len(cards)
+        self._strength = None
+        self._parser = None
+
+    @property
+    def strength(self):
+        if self._strength is None:
+            self.parse()
+        return self._strength
+
+    @property
+    def handenum(self):
+        return Hand(self.strength >> HANDSHIFT)
+
+    # hand indices are needed only for the output,
+    # so they are left to the original parser
+    @property
+    def parser(self):
+        if self._parser is None:
+            self._parser = HandParser(self.original)
+        return self._parser
+
+    @property
+    def cards(self):
+        return self.parser.cards
+
+    @property
+    def handbase(self):
+        return self.parser.handbase
+
+    @property
+    def kickers(self):
+        return self.parser.kickers
+
+    @property
+    def handbasecards(self):
+        return self.parser.handbasecards
+
+    @property
+    def kickercards(self):
+        return self.parser.kickercards
+
+    @property
+    def handfullcards(self):
+        return self.parser.handfullcards
+
+    def __str__(self):
+        return str(self.original)
+
+    def __repr__(self):
+        return f"LookupHandParser({self.original})"
+
+    def __eq__(self, other):
+        return self.strength == other.strength
+
+    def __gt__(self, other):
+        return self.strength > other.strength
+
+    def __lt__(self, other):
+        return self.strength < other.strength
+
+    def __ge__(self, other):
+        return self.strength >= other.strength
+
+    def __le__(self, other):
+        return self.strength <= other.strength
+
+    def __hash__(self):
+        return hash(self.strength)
+
+    evaluateShared = staticmethod(evaluateShared)
+
+    def __iadd__(self, cards):
+        if len(cards) > 0:
+            if self._parser is not None:
+                self._parser += cards
+            else: self.original.extend(cards)
+            self.ncards += len(cards)
+            self._strength = None
+        return self
+
+    def parse(self):
+        if self.ncards > 7:
+            self._strength = self.parser.strength
+        else: self._strength = evaluate(self.original)
@@ -1,4 +1,11 @@
 from operator import add
+from heapq import heappush, heappop
+
+def resetsIndex(method):
+    def modmethod(self, *args, **kwargs):
+        self._resetIndex()
+        return method(self, *args, **kwargs)
+    return modmethod
 
 class Player:
 
@@ -40,7 +47,75 @@ class Player:
         self.played_turn = False
 
 
+class SeatRing:
+    """
+    Seats of a group in a cyclic doubly linked list, from which seats
+    are unlinked in constant time. Unlinked seats keep their links,
+    so a walk can start at any seat, and seats that are no longer
+    members are unlinked as the walk passes them.
+    """
+    __slots__ = ["next", "prev", "linked"]
+
+    def __init__(self, members):
+        n = len(members)
+        self.linked = list(members)
+        self.next, self.prev = list(range(n)), list(range(n))
+        seats = [i for i in range(n) if members[i]]
+        if not seats: return
+        following = seats[0]
+        for i in reversed(range(n)):
+            self.next[i] = following
+            if members[i]: following = i
+        preceding = seats[-1]
+        for i in range(n):
+            self.prev[i] = preceding
+            if members[i]: preceding = i
+
+    def unlink(self, i):
+        if self.linked[i]:
+            self.linked[i] = False
+            before, after = self.prev[i], self.next[i]
+            self.next[before], self.prev[after] = after, before
+
+    def walk(self, i, is_member, backwards=False):
+        """First member seat after (or before) seat i, other than i"""
+        links = self.prev if backwards else self.next
+        n, k, distance = len(links), i, 0
+        while True:
+            j = links[k]
+            distance += ((k - j) if backwards else (j - k)) % n or n
+            if distance >= n: return None
+            if is_member(j): return j
+            self.unlink(j)
+            k = j
+
+
 class PlayerGroup(list):
+    # seats are indexed by player id, and the seats of active and
+    # unfolded players are linked in rings, all built on first use,
+    # so a player can be found and the next one moved to in constant
+    # time. Rings only lose seats, so they are reset for a new round.
+
+    def __init__(self, players=()):
+        super().__init__(players)
+        self._resetIndex()
+
+    def _resetIndex(self):
+        self._seat_ids = None
+        self.resetSeatRings()
+
+    append = resetsIndex(list.append)
+    extend = resetsIndex(list.extend)
+    insert = resetsIndex(list.insert)
+    remove = resetsIndex(list.remove)
+    pop = resetsIndex(list.pop)
+    clear = resetsIndex(list.clear)
+    sort = resetsIndex(list.sort)
+    reverse = resetsIndex(list.reverse)
+    __setitem__ = resetsIndex(list.__setitem__)
+    __delitem__ = resetsIndex(list.__delitem__)
+    __iadd__ = resetsIndex(list.__iadd__)
+    __imul__ = resetsIndex(list.__imul__)
 
     def __getitem__(self, i):
         is_slice = isinstance(i, slice)
@@ -65,9 +140,47 @@ class PlayerGroup(list):
         return counter
 
     def getPlayerById(self, _id):
-        for player in self:
-            if player.id == _id:
-                return player
+        if self._seat_ids is None: self._buildIndex()
+        i = self._seat_ids.get(_id)
+        if i is not None: return list.__getitem__(self, i)
+
+    def getSeatIndex(self, _id):
+        if self._seat_ids is None: self._buildIndex()
+        return self._seat_ids.get(_id)
+
+    def _buildIndex(self):
+        self._seat_ids = {}
+        for i, player in enumerate(self):
+            self._seat_ids.setdefault(player.id, i)
+
+    def resetSeatRings(self):
+        self._active_ring = None
+        self._unfolded_ring = None
+
+    def unlinkPlayer(self, player):
+        """Unlinks the seat of a player that folded, went all-in or left"""
+        i = self.getSeatIndex(player.id)
+        if i is None: return
+        if self._active_ring is not None and not player.is_active:
+            self._active_ring.unlink(i)
+        if self._unfolded_ring is not None and player.is_folded:
+            self._unfolded_ring.unlink(i)
+
+    def _activeRing(self):
+        if self._active_ring is None:
+            self._active_ring = SeatRing([p.is_active for p in self])
+        return self._active_ring
+
+    def _unfoldedRing(self):
+        if self._unfolded_ring is None:
+            self._unfolded_ring = SeatRing([not p.is_folded for p in self])
+        return self._unfolded_ring
+
+    def _isActive(self, i):
+        return super().__getitem__(i).is_active
+
+    def _isUnfolded(self, i):
+        return not super().__getitem__(i).is_folded
 
     def previousActivePlayer(self, i):
         j = self.previousActiveIndex(i)
@@ -78,28 +191,21 @@ class PlayerGroup(list):
         return self[j]
 
     def previousActiveIndex(self, i):
-        n = len(self)
-        rn = reversed(range(i + 1, i + n))
-        for k in map(lambda j: j % n, rn):
-            if self[k].is_active: return k
+        if not self: return None
+        return self._activeRing().walk(i % len(self), self._isActive, True)
 
     def nextActiveIndex(self, i):
-        n = len(self)
-        rn = range(i + 1, i + n)
-        for k in map(lambda j: j % n, rn):
-            if self[k].is_active: return k
+        if not self: return None
+        return self._activeRing().walk(i % len(self), self._isActive)
 
     def nextUnfoldedIndex(self, i):
-        n = len(self)
-        rn = range(i + 1, i + n)
-        for k in map(lambda j: j % n, rn):
-            if not self[k].is_folded: return k
+        if not self: return None
+        return self._unfoldedRing().walk(i % len(self), self._isUnfolded)
 
     def previousUnfoldedIndex(self, i):
-        n = len(self)
-        rn = reversed(range(i + 1, i + n))
-        for k in map(lambda j: j % n, rn):
-            if not self[k].is_folded: return k
+        if not self: return None
+        return self._unfoldedRing().walk(
+            i % len(self), self._isUnfolded, True)
 
     def getActivePlayers(self):
         return type(self)(filter(
@@ -119,10 +225,12 @@ class PlayerGroup(list):
                 return False
         return True
 
-    def winners(self):
-        winner = max(self, key=lambda x: x.hand)
+    def winners(self, strengths=None):
+        if strengths is None:
+            strengths = {player.id: player.hand.strength for player in self}
+        best = max(strengths[player.id] for player in self)
         return type(self)(
-            [player for player in self if player.hand == winner.hand]
+            [player for player in self if strengths[player.id] == best]
         )
 
     def sortedByWinningAmountProspect(self):
@@ -139,6 +247,44 @@ class PlayerGroup(list):
 
 
 class PlayerSeats(list):
+    # players are indexed by id and free seats are kept in a heap,
+    # both built on first use and updated as seats are assigned
+
+    def __init__(self, seats=()):
+        super().__init__(seats)
+        self._resetIndex()
+
+    def _resetIndex(self):
+        self._seat_ids = None
+        self._free_seats = None
+
+    def _buildIndex(self):
+        self._seat_ids, self._free_seats = {}, []
+        for i, p in enumerate(self.seats()):
+            if p is None: self._free_seats.append(i)
+            else: self._seat_ids.setdefault(p.id, i)
+
+    extend = resetsIndex(list.extend)
+    insert = resetsIndex(list.insert)
+    pop = resetsIndex(list.pop)
+    clear = resetsIndex(list.clear)
+    sort = resetsIndex(list.sort)
+    reverse = resetsIndex(list.reverse)
+    __delitem__ = resetsIndex(list.__delitem__)
+    __iadd__ = resetsIndex(list.__iadd__)
+    __imul__ = resetsIndex(list.__imul__)
+
+    def __setitem__(self, i, player):
+        if isinstance(i, slice) or self._seat_ids is None:
+            super().__setitem__(i, player)
+            return self._resetIndex()
+        i = range(len(self))[i]
+        seated = super().__getitem__(i)
+        super().__setitem__(i, player)
+        if seated is not None and self._seat_ids.get(seated.id) == i:
+            del self._seat_ids[seated.id]
+        if player is None: heappush(self._free_seats, i)
+        else: self._seat_ids.setdefault(player.id, i)
 
     def __add__(self, other):
         copy = type(self)(super().__add__([]))
@@ -157,20 +303,14 @@ class PlayerSeats(list):
                 yield p
 
     def __contains__(self, player):
-        for p in self:
-            if p.id == player.id:
-                return True
-        return False
+        return self.getSeatIndex(player.id) is not None
 
     def seats(self):
         return super().__iter__()
 
     def nFilled(self):
-        n = 0
-        for p in self:
-            if p is not None:
-                n += 1
-        return n
+        if self._seat_ids is None: self._buildIndex()
+        return len(self._seat_ids)
 
     def seatFree(self, ind: int) -> bool:
         return 0 <= ind < len(self) and self[ind] is None
@@ -182,13 +322,15 @@ class PlayerSeats(list):
         return False
 
     def remove(self, player):
-        for i, p in enumerate(super().__iter__()):
-            if p is not None and p == player:
-                self[i] = None
+        i = self.getSeatIndex(player.id)
+        if i is not None: self[i] = None
 
     def append(self, player: Player):
-        for i, p in enumerate(super().__iter__()):
-            if p is None:
+        if self._seat_ids is None: self._buildIndex()
+        # freed seats can have been taken since
+        while self._free_seats:
+            i = heappop(self._free_seats)
+            if super().__getitem__(i) is None:
                 self[i] = player
                 return i
 
@@ -198,7 +340,11 @@ class PlayerSeats(list):
             self
         ))
 
+    def getSeatIndex(self, _id):
+        if self._seat_ids is None: self._buildIndex()
+        return self._seat_ids.get(_id)
+
     def getPlayerById(self, _id):
-        for player in self:
-            if player.id == _id:
-                return player
\ No newline at end of file
+        if self._seat_ids is None: self._buildIndex()
+        i = self._seat_ids.get(_id)
+        if i is not None: return list.__getitem__(self, i)
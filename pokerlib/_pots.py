@@ -0,0 +1,51 @@
+from collections import namedtuple
+
+# A pot holds the chips staked up to its stake level, and is contested
+# by the unfolded players, whose ids are given, that staked at least
+# that much. Pots are ordered from the main pot to the last side pot.
+Pot = namedtuple('Pot', ['amount', 'stake', 'player_ids'])
+
+def buildPots(players):
+    """Main and side pots, built from the players' stakes"""
+    return stakePots(
+        [player.stake for player in players],
+        [player.is_folded for player in players],
+        [player.id for player in players]
+    )
+
+def stakePots(stakes, folded, ids):
+    """Main and side pots, built from stakes and fold flags by player id"""
+    contenders = sorted(
+        ((stake, _id) for stake, is_folded, _id in zip(stakes, folded, ids)
+         if not is_folded and stake > 0),
+        key = lambda contender: contender[0]
+    )
+    stakes = sorted(stake for stake in stakes if stake > 0)
+
+    pots, level, i = [], 0, 0
+    for k, (stake, _) in enumerate(contenders):
+        if stake == level: continue
+        # stakes up to the new level are fully in,
+        # the larger ones add the difference of levels
+        amount = 0
+        while i < len(stakes) and stakes[i] <= stake:
+            amount += stakes[i] - level
+            i += 1
+        amount += (len(stakes) - i) * (stake - level)
+        pots.append(Pot(amount, stake, tuple(_id for _, _id in contenders[k:])))
+        level = stake
+
+    # folded players' chips above the largest unfolded stake
+    excess = sum(stakes[i:]) - level * (len(stakes) - i)
+    if pots and excess:
+        pots[-1] = pots[-1]._replace(amount=pots[-1].amount + excess)
+    return pots
+
+def splitPot(amount, winners):
+    """
+    Integer shares of the pot for winners, which can be players or their
+    ids, ordered by the odd chip rule. Shares are returned in the same
+    order, the odd chips given one by one starting with the first winner.
+    """
+    share, odd = divmod(amount, len(winners))
+    return [share + (i < odd) for i in range(len(winners))]
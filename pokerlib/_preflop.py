@@ -0,0 +1,138 @@
+import struct
+from mmap import mmap, ACCESS_READ
+from concurrent.futures import ProcessPoolExecutor
+
+from ._equity import equity
+from .cards import compactCards
+
+# The preflop matrix file starts with a header of the magic bytes,
+# the format version and the number of combos, followed by the equity
+# of every combo against every combo, as a little endian uint16 scaled
+# by EQUITY_SCALE, in row-major order. Rows and columns are indexed by
+# comboIndex, entries of conflicting combos are zero.
+MAGIC = b'PFEQ'
+VERSION = 1
+NCOMBOS = 1326
+HEADER = struct.Struct('<4sHH')
+EQUITY_SCALE = 0xffff
+
+def comboIndex(card1, card2):
+    """Index of two compact cards in range(1326), regardless of order"""
+    if card1 < card2: card1, card2 = card2, card1
+    return card1 * (card1 - 1) // 2 + card2
+
+def indexCombo(index):
+    """(high, low) compact cards of the combo with the given index"""
+    high = int(((8 * index + 1) ** 0.5 + 1) / 2)
+    if high * (high - 1) // 2 > index: high -= 1
+    return high, index - high * (high - 1) // 2
+
+def _matchupKey(combo1, combo2):
+    # ranks of each suit held by either player, in sorted order,
+    # are the same for matchups that differ by a suit permutation
+    suitmasks = [[0, 0] for _ in range(4)]
+    for player, combo in enumerate((combo1, combo2)):
+        for card in combo:
+            suitmasks[card & 3][player] |= 1 << (card >> 2)
+    return tuple(sorted(map(tuple, suitmasks)))
+
+def matchupClasses():
+    """
+    Groups every pair of non-conflicting combos by their matchup up to
+    a suit permutation and the order of players. Maps a representative
+    matchup to a list of (index1, index2) pairs, ordered the same way.
+    """
+    classes, representatives = {}, {}
+    combos = [indexCombo(i) for i in range(NCOMBOS)]
+    for i, combo1 in enumerate(combos):
+        for j in range(i + 1, NCOMBOS):
+            combo2 = combos[j]
+            if combo1[0] in combo2 or combo1[1] in combo2: continue
+            key, swapped = _matchupKey(combo1, combo2), False
+            mirrored = tuple((m2, m1) for m1, m2 in key)
+            mirrored = tuple(sorted(mirrored))
+            if mirrored < key: key, swapped = mirrored, True
+            pair = (j, i) if swapped else (i, j)
+            if key not in classes:
+                classes[key] = []
+                representatives[key] = (combos[pair[0]], combos[pair[1]])
+            classes[key].append(pair)
+    return {representatives[key]: pairs for key, pairs in classes.items()}
+
+def _matchupEquity(combo1, combo2):
+    return equity([list(combo1), list(combo2)], max_evaluations=1 << 32)[0]
+
+def _matchupEquities(matchups, workers):
+    if workers == 1:
+        return list(map(_matchupEquity, *zip(*matchups)))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_matchupEquity, *zip(*matchups), chunksize=64))
+
+def writePreflopMatrix(path, equities):
+    """Writes a NCOMBOS x NCOMBOS nested list of equities to path"""
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, NCOMBOS))
+        for row in equities:
+            file.write(struct.pack(
+                f'<{NCOMBOS}H', *(round(e * EQUITY_SCALE) for e in row)))
+
+def generatePreflopMatrix(path, workers=1, classes=None):
+    """
+    Computes the exact heads-up equity of every combo against every
+    non-conflicting combo and writes them to path. Each of the 47008
+    matchups up to a suit permutation is enumerated once, over 1712304
+    boards, which takes seconds per matchup and about 50 CPU hours in
+    total, so the work can be spread over workers processes. Passing
+    a subset of matchupClasses() as classes computes only those, and
+    leaves the other entries zero.
+    """
+    if classes is None: classes = matchupClasses()
+    matchups = list(classes)
+    results = _matchupEquities(matchups, workers)
+
+    equities = [[0] * NCOMBOS for _ in range(NCOMBOS)]
+    for matchup, result in zip(matchups, results):
+        for i, j in classes[matchup]:
+            equities[i][j] = result.equity
+            equities[j][i] = 1 - result.equity
+
+    writePreflopMatrix(path, equities)
+
+
+class PreflopMatrix:
+    """
+    Heads-up preflop equities, read from a memory mapped matrix file,
+    so processes that load the same file share its pages
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+        magic, version, ncombos = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or ncombos != NCOMBOS:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a preflop matrix file')
+        if len(self._mmap) != HEADER.size + 2 * NCOMBOS * NCOMBOS:
+            self._mmap.close()
+            raise ValueError(f'{path} is truncated')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def indexEquity(self, index1, index2):
+        """Equity of the combo at index1 against the combo at index2"""
+        offset = HEADER.size + 2 * (index1 * NCOMBOS + index2)
+        return struct.unpack_from('<H', self._mmap, offset)[0] / EQUITY_SCALE
+
+    def equity(self, hole1, hole2):
+        """Equity of the first player's hole cards against the second's"""
+        hole1, hole2 = compactCards(hole1), compactCards(hole2)
+        if len(set(hole1 + hole2)) != 4:
+            raise ValueError('hole cards should be four different cards')
+        return self.indexEquity(comboIndex(*hole1), comboIndex(*hole2))
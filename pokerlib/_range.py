@@ -0,0 +1,161 @@
+from itertools import permutations, combinations
+
+from ._equity import Equity, equity
+from .cards import compactCards
+
+RANK_CHARS = '23456789TJQKA'
+SUIT_CHARS = 'scdh'
+
+# every suit permutation, given as a mapping of compact cards
+SUIT_PERMUTATIONS = [
+    [card & ~3 | perm[card & 3] for card in range(52)]
+    for perm in permutations(range(4))
+]
+
+def _combo(card1, card2):
+    return (card1, card2) if card1 > card2 else (card2, card1)
+
+def _parseRank(char):
+    rank = RANK_CHARS.find(char.upper())
+    if rank < 0: raise ValueError(f'invalid rank {char}')
+    return rank
+
+def _parseClass(text):
+    """Parses a hand class, e.g. AKs, into (high rank, low rank, kind)"""
+    if not 2 <= len(text) <= 3:
+        raise ValueError(f'invalid hand class {text}')
+    high, low = _parseRank(text[0]), _parseRank(text[1])
+    kind = text[2].lower() if len(text) == 3 else ''
+    if kind not in ('', 's', 'o') or high == low and kind:
+        raise ValueError(f'invalid hand class {text}')
+    if high < low: high, low = low, high
+    return high, low, kind
+
+def _classCombos(high, low, kind):
+    if high == low: return [
+        _combo(high << 2 | suit1, high << 2 | suit2)
+        for suit1, suit2 in combinations(range(4), 2)
+    ]
+    return [
+        _combo(high << 2 | suit1, low << 2 | suit2)
+        for suit1 in range(4) for suit2 in range(4)
+        if not kind or (kind == 's') == (suit1 == suit2)
+    ]
+
+def _expandToken(token):
+    """Hand classes described by a range token, e.g. QQ+ or 76s-54s"""
+    if '-' in token:
+        first, last = map(_parseClass, token.split('-'))
+        (high1, low1, kind), (high2, low2, kind2) = first, last
+        if kind != kind2:
+            raise ValueError(f'invalid range {token}')
+        if high1 == low1 and high2 == low2:
+            ranks = range(min(high1, high2), max(high1, high2) + 1)
+            return [(rank, rank, '') for rank in ranks]
+        if high1 == high2:
+            kickers = range(min(low1, low2), max(low1, low2) + 1)
+            return [(high1, kicker, kind) for kicker in kickers]
+        if high1 - low1 == high2 - low2:
+            gap = high1 - low1
+            highs = range(min(high1, high2), max(high1, high2) + 1)
+            return [(high, high - gap, kind) for high in highs]
+        raise ValueError(f'invalid range {token}')
+
+    if token.endswith('+'):
+        high, low, kind = _parseClass(token[:-1])
+        if high == low:
+            return [(rank, rank, '') for rank in range(high, 13)]
+        return [(high, kicker, kind) for kicker in range(low, high)]
+
+    return [_parseClass(token)]
+
+def parseRange(text):
+    """
+    Parses a hand range, e.g. "AKs, QQ+, 76s-54s:0.5, AhKd", into a dict
+    mapping its combos - (high card, low card) pairs of compact cards -
+    to their weights, which default to 1
+    """
+    combos = {}
+    for token in text.split(','):
+        token = token.strip()
+        if not token: continue
+        weight = 1
+        if ':' in token:
+            token, weight = token.split(':')
+            token, weight = token.strip(), float(weight)
+
+        if len(token) == 4 and token[1].lower() in SUIT_CHARS \
+                and token[3].lower() in SUIT_CHARS:
+            cards = [
+                _parseRank(token[i]) << 2 | SUIT_CHARS.index(token[i+1].lower())
+                for i in (0, 2)
+            ]
+            if cards[0] == cards[1]:
+                raise ValueError(f'invalid combo {token}')
+            combos[_combo(*cards)] = weight
+            continue
+
+        for hand_class in _expandToken(token):
+            for combo in _classCombos(*hand_class):
+                combos[combo] = weight
+
+    return combos
+
+def _boardPermutations(board, dead):
+    """Suit permutations mapping board and dead cards to canonical form"""
+    keys = [
+        (sorted(map(perm.__getitem__, board)),
+         sorted(map(perm.__getitem__, dead)))
+        for perm in SUIT_PERMUTATIONS
+    ]
+    best = min(keys)
+    return [
+        perm for perm, key in zip(SUIT_PERMUTATIONS, keys)
+        if key == best
+    ]
+
+def rangeEquity(
+    range1, range2, board=(), dead=(),
+    max_evaluations=200000, samples=10000, seed=0
+):
+    """
+    Weighted equities of two ranges against each other. Ranges are
+    given as dicts mapping combos to weights (as returned by parseRange)
+    or as range strings. Matchups that are the same up to a suit
+    permutation are evaluated only once.
+    """
+    if isinstance(range1, str): range1 = parseRange(range1)
+    if isinstance(range2, str): range2 = parseRange(range2)
+    board, dead = compactCards(board), compactCards(dead)
+    blocked = set(board) | set(dead)
+
+    perms = _boardPermutations(board, dead)
+    results, total = {}, 0
+    sums = [[0] * 4, [0] * 4]
+
+    for combo1, weight1 in range1.items():
+        if blocked.intersection(combo1): continue
+        for combo2, weight2 in range2.items():
+            if blocked.intersection(combo2): continue
+            if combo1[0] in combo2 or combo1[1] in combo2: continue
+
+            key = min(
+                (_combo(perm[combo1[0]], perm[combo1[1]]),
+                 _combo(perm[combo2[0]], perm[combo2[1]]))
+                for perm in perms
+            )
+            if key not in results:
+                results[key] = equity(
+                    [list(combo1), list(combo2)], board, dead,
+                    max_evaluations, samples, f'{seed}:{key}'
+                )
+
+            weight = weight1 * weight2
+            total += weight
+            for player_sums, result in zip(sums, results[key]):
+                for i, value in enumerate(result):
+                    player_sums[i] += weight * value
+
+    if total == 0:
+        raise ValueError('ranges have no compatible combos')
+    return [Equity(*(value / total for value in s)) for s in sums]
@@ -1,10 +1,30 @@
-from math import inf
+from copy import copy
 from random import sample
 from collections import namedtuple, deque
 from abc import ABC
 
 from .enums import Rank, Suit, Turn, RoundPublicInId, RoundPrivateOutId, RoundPublicOutId
-from ._handparser import HandParser, HandParserGroup
+from ._handparser import HandParser, strengthsKicker
+from ._pots import buildPots, splitPot
+from .cards import DECK, compactCards
+
+# state of a round and its players that changes with actions,
+# from which the round can be restored
+RoundState = namedtuple('RoundState', [
+    'turn', 'nboard', 'current_index', 'finished', 'closed',
+    'turn_stakes', 'pot_sizes', 'all_in_stake', 'active_stakes',
+    'muck_optioned_player_ids', 'players'
+])
+PlayerState = namedtuple('PlayerState', [
+    'money', 'stake', 'turn_stake', 'is_folded', 'is_all_in',
+    'played_turn', 'group_kickers'
+])
+
+def outMask(*out_ids):
+    """Subscription mask of the given out ids, for Round's out masks"""
+    mask = 0
+    for out_id in out_ids: mask |= 1 << out_id
+    return mask
 
 
 """
@@ -37,6 +57,12 @@ class AbstractRound(ABC):
     PublicInId = RoundPublicInId
     PublicOutId = RoundPublicOutId
     PrivateOutId = RoundPrivateOutId
+    HandParserClass = HandParser
+    # deal cards as compact ints instead of (rank, suit) pairs
+    compact_cards = False
+    # complete and evaluate players' hands only at showdown,
+    # or when requested with getPlayerHand
+    lazy_hands = False
     __deck = [[rank, suit] for suit in Suit for rank in Rank]
 
     def __init__(self, _id, players, button, small_blind, big_blind):
@@ -54,9 +80,20 @@ class AbstractRound(ABC):
         self.board = list()
         self.turn = None
 
-        self._deck = self._deckIterator()
+        # running totals, updated as chips are added to the pot:
+        # the largest stake and the pot of each street, the largest
+        # all-in stake of the current street and the number of active
+        # players that staked each amount on the current street
+        self._turn_stakes = [0, 0, 0, 0]
+        self._pot_sizes = [0, 0, 0, 0]
+        self._all_in_stake = 0
+        self._active_stakes = {}
+
+        self._deck_cards = list(self._deckIterator())
+        self._deck = iter(self._deck_cards)
         self._turn_generator = self._turnGenerator()
         self._muck_optioned_player_ids = []
+        self._history = []
 
         self._startRound()
 
@@ -96,17 +133,11 @@ class AbstractRound(ABC):
 
     @property
     def turn_stake(self):
-        return max(map(
-            lambda player: player.turn_stake[self.turn],
-            self.players
-        ))
+        return self._turn_stakes[self.turn]
 
     @property
     def pot_size(self):
-        return list(map(lambda i: sum(map(
-            lambda player: player.turn_stake[i],
-            self.players
-        )), range(4)))
+        return list(self._pot_sizes)
 
     @property
     def to_call(self):
@@ -115,17 +146,22 @@ class AbstractRound(ABC):
 
     def _deckIterator(self):
         ncards = len(self.players) * 2 + 5
-        return iter(sample(self.__deck, ncards))
+        deck = DECK if self.compact_cards else self.__deck
+        return iter(sample(deck, ncards))
 
-    def _turnGenerator(self):
-        for i, turn in zip((0,3,1,1), Turn):
+    def _turnGenerator(self, start=Turn.PREFLOP):
+        for i, turn in list(zip((0,3,1,1), Turn))[start:]:
             self.turn = turn
             new_cards = [next(self._deck) for _ in range(i)]
 
+            self._all_in_stake = 0
+            self._active_stakes = {0: self.players.countActivePlayers()}
+
             for player in self.players:
                 player.played_turn = False
-                player.hand += new_cards
-                player.hand.parse()
+                if not self.lazy_hands:
+                    player.hand += new_cards
+                    player.hand.parse()
 
             self.board.extend(new_cards)
 
@@ -136,43 +172,154 @@ class AbstractRound(ABC):
 
             yield
 
-    def _potsBalanced(self):
-        active_pots = [
-            player.turn_stake[self.turn]
-            for player in self.players
-            if player.is_active
-        ] or [inf]
-
-        all_in_max_pot = max([
-            player.turn_stake[self.turn]
-            for player in self.players
-            if player.is_all_in
-        ] or [0])
-
-        return (
-            len(set(active_pots)) == 1 and
-            active_pots[0] >= all_in_max_pot
+    def _completeHand(self, player):
+        # adds the board cards that were dealt since the hand was updated
+        missing = self.board[player.hand.ncards - len(player.cards):]
+        if missing: player.hand += missing
+        return player.hand
+
+    def getPlayerHand(self, player_id):
+        """Player's hand, with the current board"""
+        player = self.players.getPlayerById(player_id)
+        return self._completeHand(player)
+
+    def snapshot(self):
+        """State of the round, that can be restored with restore"""
+        return RoundState(
+            self.turn, len(self.board), self.current_index,
+            self.finished, self.closed,
+            tuple(self._turn_stakes), tuple(self._pot_sizes),
+            self._all_in_stake, tuple(self._active_stakes.items()),
+            tuple(self._muck_optioned_player_ids),
+            tuple(PlayerState(
+                player.money, player.stake, tuple(player.turn_stake),
+                player.is_folded, player.is_all_in, player.played_turn,
+                player.group_kickers
+            ) for player in self.players)
         )
 
+    def restore(self, state):
+        """Restores the round and its players to a snapshot's state"""
+        self.turn = state.turn
+        self.current_index = state.current_index
+        self.finished, self.closed = state.finished, state.closed
+        self._turn_stakes = list(state.turn_stakes)
+        self._pot_sizes = list(state.pot_sizes)
+        self._all_in_stake = state.all_in_stake
+        self._active_stakes = dict(state.active_stakes)
+        self._muck_optioned_player_ids = list(state.muck_optioned_player_ids)
+
+        # the deck and streets continue from where the snapshot was taken
+        dealt = 2 * len(self.players)
+        self.board = self._deck_cards[dealt:dealt+state.nboard]
+        self._deck = iter(self._deck_cards[dealt+state.nboard:])
+        self._turn_generator = self._turnGenerator(
+            Turn.PREFLOP if state.turn is None else state.turn + 1)
+
+        for player, player_state in zip(self.players, state.players):
+            player.money, player.stake, turn_stake, player.is_folded, \
+                player.is_all_in, player.played_turn, player.group_kickers \
+                = player_state
+            player.turn_stake = list(turn_stake)
+            # hands that were given later cards are dealt again
+            ncards = len(player.cards) + state.nboard
+            if player.hand.ncards > ncards or \
+                    not self.lazy_hands and player.hand.ncards < ncards:
+                player.hand = self.HandParserClass(
+                    list(player.cards) + self.board)
+        self.players.resetSeatRings()
+
+    def legalActions(self):
+        """Actions the current player can take, before the round finishes"""
+        if self.finished: return []
+        to_call, money = self.to_call, self.current_player.money
+        actions = [self.PublicInId.FOLD]
+        if to_call == 0: actions.append(self.PublicInId.CHECK)
+        else: actions.append(self.PublicInId.CALL)
+        if to_call < money: actions.append(self.PublicInId.RAISE)
+        actions.append(self.PublicInId.ALLIN)
+        return actions
+
+    def apply(self, action, raise_by=0):
+        """Takes the current player's action, so that it can be undone"""
+        if action not in self.legalActions():
+            raise ValueError(f'{action} is not a legal action')
+        if action is self.PublicInId.RAISE and raise_by <= 0:
+            raise ValueError('raise_by should be positive')
+        self._history.append(self.snapshot())
+        self.publicIn(self.current_player.id, action, raise_by=raise_by)
+
+    def undo(self):
+        """Undoes the last applied action"""
+        if not self._history: raise ValueError('no action to undo')
+        self.restore(self._history.pop())
+
+    def clone(self):
+        """
+        Round with the same state and copies of the players, that can
+        be played on independently, along with the applied actions
+        """
+        clone = copy(self)
+        clone.players = type(self.players)(map(copy, self.players))
+        for player in clone.players:
+            player.hand = self.HandParserClass(list(player.cards))
+        clone._history = list(self._history)
+        clone.restore(self.snapshot())
+        return clone
+
+    def _countActiveStake(self, stake, n):
+        count = self._active_stakes.get(stake, 0) + n
+        if count: self._active_stakes[stake] = count
+        else: del self._active_stakes[stake]
+
+    def _potsBalanced(self):
+        # all active players staked the same amount,
+        # which is at least the largest all-in stake
+        if len(self._active_stakes) > 1: return False
+        for stake in self._active_stakes:
+            return stake >= self._all_in_stake
+        return True
+
     def _addToPot(self, player, money):
+        turn = self.turn
+        if player.is_active:
+            self._countActiveStake(player.turn_stake[turn], -1)
+
         if 0 <= money < player.money:
             player.money -= money
-            player.turn_stake[self.turn] += money
+            player.turn_stake[turn] += money
             player.stake += money
-            return money
+            paid = money
         else:
-            all_in_stake = player.money
-            player.turn_stake[self.turn] += all_in_stake
-            player.stake += all_in_stake
+            paid = player.money
+            player.turn_stake[turn] += paid
+            player.stake += paid
             player.money = 0
             player.is_all_in = True
 
+        stake = player.turn_stake[turn]
+        self._pot_sizes[turn] += paid
+        if stake > self._turn_stakes[turn]:
+            self._turn_stakes[turn] = stake
+
+        if player.is_active: self._countActiveStake(stake, 1)
+        elif player.is_all_in:
+            self.players.unlinkPlayer(player)
+            if stake > self._all_in_stake:
+                self._all_in_stake = stake
             self.publicOut(
                 self.PublicOutId.PLAYERISALLIN,
                 player_id = player.id,
-                all_in_stake = all_in_stake
+                all_in_stake = paid
             )
-            return all_in_stake
+
+        return paid
+
+    def _foldPlayer(self, player):
+        if player.is_active:
+            self._countActiveStake(player.turn_stake[self.turn], -1)
+        player.is_folded = True
+        self.players.unlinkPlayer(player)
 
     def _startRound(self):
         self.publicOut(self.PublicOutId.NEWROUND)
@@ -180,12 +327,13 @@ class AbstractRound(ABC):
         for player in self.players:
             player.resetState()
             player.cards = (next(self._deck), next(self._deck))
-            player.hand = HandParser(list(player.cards))
+            player.hand = self.HandParserClass(list(player.cards))
 
             self.privateOut(
                 player.id,
                 self.PrivateOutId.DEALTCARDS
             )
+        self.players.resetSeatRings()
 
         next(self._turn_generator)
         self._dealSmallBlind()
@@ -230,60 +378,66 @@ class AbstractRound(ABC):
         )
 
     def _dealWinnings(self):
-        stake_sorted = self.players.sortedByWinningAmountProspect()
-
-        grouped_indexes = [0]
-        for i in range(1, len(stake_sorted)):
-            if stake_sorted[i - 1].stake < stake_sorted[i].stake:
-                grouped_indexes.append(i)
-
-        for i in grouped_indexes:
-            subgame_competitors = stake_sorted[i:]
-            subgame_stake = subgame_competitors[0].stake
-
-            hands = [p.hand for p in subgame_competitors]
-            hands = HandParserGroup(hands)
-            kickers = hands.getGroupKicker()
-
-            winning_players = subgame_competitors.winners()
-            nsplit = len(winning_players)
-
-            take_from = []
-            for player in self.players:
-                if 0 < player.stake <= subgame_stake:
-                    take_from.append(player.stake / nsplit)
-                elif 0 < subgame_stake <= player.stake:
-                    take_from.append(subgame_stake / nsplit)
-                else: take_from.append(0)
-
-            for win_split in winning_players:
-                win_took = 0
-
-                for player, take in zip(self.players, take_from):
-                    win_took += take
-                    player.stake -= take
+        # all showdown hands are evaluated at once against the board by
+        # parser classes that provide a shared evaluation, so that hands
+        # are parsed only when their cards are output
+        competitors = self.players.getNotFoldedPlayers()
+        for player in competitors: self._completeHand(player)
+        evaluate = getattr(self.HandParserClass, 'evaluateShared', None)
+        strengths = dict(zip(
+            [player.id for player in competitors],
+            [p.hand.strength for p in competitors] if evaluate is None
+            else evaluate(self.board, [p.cards for p in competitors])
+        ))
+        self._showdown_strengths = strengths
+
+        # odd chips go to the winners closest to the left of the button
+        nplayers = len(self.players)
+        players_by_id = {player.id: player for player in self.players}
+        seat_order = {
+            player.id: (i - self.button - 1) % nplayers
+            for i, player in enumerate(self.players)
+        }
+
+        for pot_index, pot in enumerate(buildPots(self.players)):
+            pot_competitors = type(self.players)(
+                [players_by_id[_id] for _id in pot.player_ids])
+            kickers = strengthsKicker(
+                [strengths[player.id] for player in pot_competitors])
+
+            winning_players = sorted(
+                pot_competitors.winners(strengths),
+                key = lambda player: seat_order[player.id]
+            )
+            shares = splitPot(pot.amount, winning_players)
 
-                if round(win_took):
-                    win_split.money += round(win_took)
-                    win_split.group_kickers = kickers
+            for winner, won in zip(winning_players, shares):
+                if won == 0: continue
+                winner.money += won
+                winner.group_kickers = kickers
+                self.publicOut(
+                    self.PublicOutId.DECLAREFINISHEDWINNER,
+                    player_id = winner.id,
+                    money_won = won,
+                    pot_index = pot_index,
+                    pot = pot
+                )
 
-                    self.publicOut(
-                        self.PublicOutId.DECLAREFINISHEDWINNER,
-                        player_id = win_split.id,
-                        money_won = round(win_took)
-                    )
+        for player in self.players:
+            player.stake = 0
 
         self._showdown()
 
     def _showdown(self):
+        strengths = self._showdown_strengths
         showdown_initiator_index = self.last_aggressor_index \
             if self.turn_stake > 0 else self.starting_player_index
-        current_best_hand = self.players[showdown_initiator_index].hand
+        current_best = -1
         for i in range(len(self.players)):
             player = self.players[showdown_initiator_index + i]
             if player.is_folded: continue
-            if i == 0 or player.hand >= current_best_hand:
-                current_best_hand = player.hand
+            if i == 0 or strengths[player.id] >= current_best:
+                current_best = strengths[player.id]
                 self.publicOut(
                     self.PublicOutId.PUBLICCARDSHOW,
                     player_id = player.id,
@@ -345,7 +499,7 @@ class AbstractRound(ABC):
             self._requireAction()
 
     def _fold(self):
-        self.current_player.is_folded = True
+        self._foldPlayer(self.current_player)
         self.publicOut(
             self.PublicOutId.PLAYERFOLD,
             player_id = self.current_player.id
@@ -452,12 +606,22 @@ class AbstractRound(ABC):
 class Round(AbstractRound):
     PublicOut = namedtuple('PublicOut', ['id', 'data'])
     PrivateOut = namedtuple('PrivateOut', ['player_id', 'id', 'data'])
+    # outs whose ids are not in the masks are dropped before they are
+    # extended or queued, -1 keeps all of them and 0 makes a silent round
+    public_out_mask = -1
+    private_out_mask = -1
 
     def __init__(self, *args):
         self.public_out_queue = deque([])
         self.private_out_queue = deque([])
         super().__init__(*args)
 
+    def clone(self):
+        clone = super().clone()
+        clone.public_out_queue = deque([])
+        clone.private_out_queue = deque([])
+        return clone
+
     def publicIn(self, player_id, action, raise_by=0):
         if self.closed: return # can't do anything if round is closed
         if self.finished: # if round is finished, only show/muck is allowed
@@ -483,6 +647,7 @@ class Round(AbstractRound):
 
     def privateOut(self, player_id, out_id, **kwargs):
         """Player out implementation"""
+        if not self.private_out_mask >> out_id & 1: return
         # A solution for interacting with an outside io
         kwargs.update(self.extendedPrivateOut(player_id, out_id, kwargs))
         out = self.PrivateOut(player_id, out_id, kwargs)
@@ -490,6 +655,7 @@ class Round(AbstractRound):
 
     def publicOut(self, out_id, **kwargs):
         """Game out implementation"""
+        if not self.public_out_mask >> out_id & 1: return
         # A solution for interacting with an outside io
         kwargs.update(self.extendedPublicOut(out_id, kwargs))
         out = self.PublicOut(out_id, kwargs)
@@ -515,9 +681,11 @@ class Round(AbstractRound):
             return {'cards': player.cards}
         elif out_id is self.PublicOutId.DECLAREFINISHEDWINNER:
             player = self.players.getPlayerById(kwargs['player_id'])
+            hand = list(player.hand.handbasecards)
+            if self.compact_cards: hand = compactCards(hand)
             return {
                 'cards': player.cards,
                 'handname': player.hand.handenum,
-                'hand': list(player.hand.handbasecards)
+                'hand': hand
             }
         else: return dict()
@@ -98,7 +98,7 @@ class AbstractTable(ABC):
                     player.id, self.RoundClass.PublicInId.FOLD
                 )
             else:
-                player.is_folded = True
+                self.round._foldPlayer(player)
                 self.round._postActionStateUpdate(False)
         # notify that player was removed from table
         self.publicOut(
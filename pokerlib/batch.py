@@ -0,0 +1,50 @@
+import numpy as np
+
+from . import _lookup
+from ._lookup import HANDSHIFT, RANK_KEYS
+
+# numpy versions of the lookup tables, the rank table is stored as
+# its keys in sorted order, so that keys are resolved by binary search
+_rank_keys = None
+_rank_strengths = None
+_flush_strengths = None
+
+def _buildArrays():
+    global _rank_keys, _rank_strengths, _flush_strengths
+    if _lookup._rank_table is None: _lookup._buildTables()
+
+    keys = np.fromiter(_lookup._rank_table.keys(), dtype=np.int64)
+    strengths = np.fromiter(_lookup._rank_table.values(), dtype=np.int64)
+    order = np.argsort(keys)
+    _rank_keys, _rank_strengths = keys[order], strengths[order]
+    _flush_strengths = np.array(_lookup._flush_table, dtype=np.int64)
+
+def evaluateBatch(cards):
+    """
+    Strengths and hand enum values of N hands given as an (N, k) array
+    of compact cards, where k is at most 7
+    """
+    if _rank_keys is None: _buildArrays()
+
+    cards = np.asarray(cards, dtype=np.int64)
+    if cards.ndim != 2 or cards.shape[1] > 7:
+        raise ValueError('cards should be an (N, k) array with k <= 7')
+
+    ranks, suits = cards >> 2, cards & 3
+    rank_bits = np.left_shift(1, ranks)
+
+    rank_keys = np.take(np.array(RANK_KEYS, dtype=np.int64), ranks).sum(axis=1)
+    strengths = _rank_strengths[np.searchsorted(_rank_keys, rank_keys)]
+
+    # with at most 7 cards, a hand can have only one flush suit
+    suit_counts = np.stack([
+        np.count_nonzero(suits == suit, axis=1) for suit in range(4)
+    ], axis=1)
+    flushed = suit_counts.max(axis=1) >= 5
+    if flushed.any():
+        flush_suits = suit_counts[flushed].argmax(axis=1)
+        in_suit = suits[flushed] == flush_suits[:, None]
+        suit_masks = np.where(in_suit, rank_bits[flushed], 0).sum(axis=1)
+        strengths[flushed] = _flush_strengths[suit_masks]
+
+    return strengths, strengths >> HANDSHIFT
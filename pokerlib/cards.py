@@ -0,0 +1,76 @@
+from .enums import Rank, Suit
+
+# A compact card is an int in range(52). Cards are ordered by rank
+# and then by suit, so that card >> 2 is the card's rank and card & 3
+# its suit. A collection of compact cards fits into a 64-bit mask,
+# where card c is represented by the bit 1 << c.
+
+DECK = tuple(range(52))
+CARD_TUPLES = tuple((rank, suit) for rank in Rank for suit in Suit)
+
+def makeCard(rank, suit):
+    return rank << 2 | suit
+
+def cardRank(card):
+    return CARD_TUPLES[card][0]
+
+def cardSuit(card):
+    return CARD_TUPLES[card][1]
+
+def isCompact(card):
+    return type(card) is int
+
+def toCompact(card):
+    if type(card) is int: return card
+    rank, suit = card
+    return rank << 2 | suit
+
+def toTuple(card):
+    if type(card) is int: return CARD_TUPLES[card]
+    return card
+
+def compactCards(cards):
+    return [toCompact(card) for card in cards]
+
+def tupleCards(cards):
+    return [toTuple(card) for card in cards]
+
+def cardMask(cards):
+    mask = 0
+    for card in cards:
+        mask |= 1 << toCompact(card)
+    return mask
+
+def maskCards(mask):
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(low.bit_length() - 1)
+        mask ^= low
+    return cards
+
+def suitRelabeling(hole, board=()):
+    """
+    Maps each suit of the given compact cards to its canonical suit,
+    suits are ordered by the ranks they have in the hole and on board
+    """
+    signatures = [[0, 0, suit] for suit in range(4)]
+    for card in hole: signatures[card & 3][0] |= 1 << (card >> 2)
+    for card in board: signatures[card & 3][1] |= 1 << (card >> 2)
+    signatures.sort(reverse=True)
+    relabeling = [0] * 4
+    for canonical, (_, _, suit) in enumerate(signatures):
+        relabeling[suit] = canonical
+    return relabeling
+
+def canonicalForm(hole, board=()):
+    """
+    Hole cards and board as sorted tuples of compact cards, which are
+    the same for all hands that differ only by a suit permutation
+    """
+    hole, board = compactCards(hole), compactCards(board)
+    relabeling = suitRelabeling(hole, board)
+    return (
+        tuple(sorted(card & ~3 | relabeling[card & 3] for card in hole)),
+        tuple(sorted(card & ~3 | relabeling[card & 3] for card in board))
+    )
@@ -92,3 +92,4 @@ class TablePrivateOutId(IntEnum):
     PLAYERALREADYATTABLE = 3
     PLAYERNOTATTABLE = 4
     INCORRECTSEATINDEX = 5
+    ACTIONFAILED = 6
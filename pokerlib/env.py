@@ -0,0 +1,128 @@
+from random import Random
+
+import numpy as np
+
+from .cards import DECK
+from ._lookup import LookupHandParser
+from ._player import Player, PlayerGroup
+from ._round import Round
+from .observation import ObservationEncoder
+
+# indices of the actions taken by VectorEnv.step, calling is checking
+# when there is nothing to call, and raises that can't be covered go all-in
+FOLD, CALL, RAISE, ALLIN = range(4)
+NACTIONS = 4
+
+class EnvRound(Round):
+    """Silent round with compact cards, dealt by the given random generator"""
+    HandParserClass = LookupHandParser
+    compact_cards = True
+    lazy_hands = True
+    public_out_mask = 0
+    private_out_mask = 0
+
+    def __init__(self, _id, players, button, small_blind, big_blind, rng):
+        self._random = rng
+        super().__init__(_id, players, button, small_blind, big_blind)
+
+    def _deckIterator(self):
+        return iter(self._random.sample(DECK, 2 * len(self.players) + 5))
+
+
+class VectorEnv:
+    """
+    N independent rounds between the same number of seats, stepped
+    together. Each step takes an action for the player to act in every
+    round, and writes the observations, rewards and done flags of the
+    whole batch into preallocated buffers, which it returns. Finished
+    rounds are reset to a new round with the starting stacks and the
+    button moved by a seat, and their observation is that of the new
+    round. Rewards are the seats' chip results of the rounds that
+    finished in the step, and zero otherwise. Observations are laid out
+    by ObservationEncoder, whose legal CHECK and CALL both map to CALL.
+    """
+
+    def __init__(self, nenvs, nseats=2, stack=1000, small_blind=5,
+                 big_blind=10, seed=None):
+        if nseats < 2: raise ValueError('at least two seats are needed')
+        self.nenvs = nenvs
+        self.nseats = nseats
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self._random = Random(seed)
+        self.rounds = [None] * nenvs
+        self._buttons = [0] * nenvs
+        self._nrounds = 0
+
+        # observations of the players to act, laid out by the encoder
+        self.encoder = ObservationEncoder(nseats)
+        self.obs_size = self.encoder.size
+        self.observations = np.zeros((nenvs, self.obs_size), dtype=np.float32)
+        self.rewards = np.zeros((nenvs, nseats), dtype=np.float32)
+        self.dones = np.zeros(nenvs, dtype=bool)
+        self.current_seats = np.zeros(nenvs, dtype=np.int64)
+
+    def reset(self):
+        """Starts a new round in every environment"""
+        for i in range(self.nenvs):
+            self._resetRound(i)
+        self._observe()
+        self.rewards.fill(0)
+        self.dones.fill(False)
+        return self.observations
+
+    def step(self, actions, raise_by=None):
+        """
+        Takes the actions, as action indices, for the player to act in
+        each round, where raise_by gives the raise amounts of raises and
+        defaults to the big blind. Returns observations, rewards (one per
+        seat) and done flags, as views of the environment's buffers.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.nenvs,):
+            raise ValueError(f'expected {self.nenvs} actions')
+        rewards, dones = self.rewards, self.dones
+        rewards.fill(0)
+        for i, action in enumerate(actions.tolist()):
+            round = self.rounds[i]
+            raise_amount = self.big_blind if raise_by is None else raise_by[i]
+            self._act(round, action, int(raise_amount))
+            dones[i] = done = round.finished
+            if done:
+                rewards[i] = [player.money - self.stack for player in round.players]
+                self._resetRound(i)
+        self._observe()
+        return self.observations, rewards, dones
+
+    def _resetRound(self, i):
+        players = PlayerGroup([
+            Player(None, seat, str(seat), self.stack)
+            for seat in range(self.nseats)
+        ])
+        button = self._buttons[i]
+        self._buttons[i] = (button + 1) % self.nseats
+        self.rounds[i] = EnvRound(
+            self._nrounds, players, button,
+            self.small_blind, self.big_blind, self._random
+        )
+        self._nrounds += 1
+
+    def _act(self, round, action, raise_by):
+        PublicInId = round.PublicInId
+        player = round.current_player
+        to_call = round.to_call
+        if action == CALL:
+            action = PublicInId.CALL if to_call else PublicInId.CHECK
+        elif action == RAISE:
+            if to_call >= player.money: action = PublicInId.ALLIN
+            else: action, raise_by = PublicInId.RAISE, max(raise_by, 1)
+        elif action == FOLD: action = PublicInId.FOLD
+        elif action == ALLIN: action = PublicInId.ALLIN
+        else: raise ValueError(f'{action} is not an action index')
+        round.publicIn(player.id, action, raise_by=raise_by)
+
+    def _observe(self):
+        for i, round in enumerate(self.rounds):
+            self.current_seats[i] = round.current_index
+        self.encoder.encodeBatch(self.rounds, self.observations)
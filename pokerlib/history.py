@@ -0,0 +1,302 @@
+import io, os
+from mmap import mmap, ACCESS_READ
+from collections import namedtuple
+
+from .enums import (
+    Rank, Hand, Turn, RoundPublicOutId, RoundPrivateOutId
+)
+from .cards import CARD_TUPLES, toCompact
+from ._pots import Pot
+from ._round import Round
+
+# A history file starts with the magic bytes and the format version,
+# followed by records that each start with a tag byte. A round header
+# record is tagged ROUND_TAG, a public out with its out id and a private
+# out with PRIVATE_TAG | its out id. Integers are unsigned LEB128 varints,
+# signed ones are zigzag encoded first, and cards are single compact
+# card bytes, while sequences of cards are prefixed by their length.
+# Player and round ids are varints too, so they have to be non-negative
+# integers.
+MAGIC = b'PKHH'
+VERSION = 1
+ROUND_TAG = 0xff
+PRIVATE_TAG = 0x80
+NO_RANK = 0xff
+BUFFER_SIZE = 1 << 16
+
+RoundHeader = namedtuple('RoundHeader', [
+    'round_id', 'compact_cards', 'small_blind', 'big_blind',
+    'button', 'players'
+])
+
+# fields stored for each out, in order, with the kind of their value,
+# other fields of an out's data are not stored
+_ID, _CHIPS, _SIGNED, _TURN, _CARDS, _CARDLIST, _RANK, _HAND, _POT = range(9)
+PUBLIC_FIELDS = {
+    RoundPublicOutId.NEWROUND: (),
+    RoundPublicOutId.NEWTURN: (('turn', _TURN), ('board', _CARDLIST)),
+    RoundPublicOutId.SMALLBLIND: (
+        ('player_id', _ID), ('paid_amount', _CHIPS), ('small_blind', _CHIPS)),
+    RoundPublicOutId.BIGBLIND: (
+        ('player_id', _ID), ('paid_amount', _CHIPS), ('big_blind', _CHIPS)),
+    RoundPublicOutId.PLAYERCHECK: (('player_id', _ID),),
+    RoundPublicOutId.PLAYERCALL: (
+        ('player_id', _ID), ('paid_amount', _CHIPS)),
+    RoundPublicOutId.PLAYERFOLD: (('player_id', _ID),),
+    RoundPublicOutId.PLAYERRAISE: (
+        ('player_id', _ID), ('raised_by', _SIGNED), ('paid_amount', _CHIPS)),
+    RoundPublicOutId.PLAYERISALLIN: (
+        ('player_id', _ID), ('all_in_stake', _CHIPS)),
+    RoundPublicOutId.PLAYERWENTALLIN: (
+        ('player_id', _ID), ('paid_amount', _CHIPS)),
+    RoundPublicOutId.PLAYERREVEALCARDS: (
+        ('player_id', _ID), ('cards', _CARDS)),
+    RoundPublicOutId.PLAYERMUCKCARDS: (('player_id', _ID),),
+    RoundPublicOutId.PLAYERACTIONREQUIRED: (
+        ('player_id', _ID), ('to_call', _CHIPS)),
+    RoundPublicOutId.PLAYERCHOICEREQUIRED: (('player_id', _ID),),
+    RoundPublicOutId.PUBLICCARDSHOW: (
+        ('player_id', _ID), ('cards', _CARDS), ('kickers', _RANK)),
+    RoundPublicOutId.DECLAREPREMATUREWINNER: (
+        ('player_id', _ID), ('money_won', _CHIPS)),
+    RoundPublicOutId.DECLAREFINISHEDWINNER: (
+        ('player_id', _ID), ('money_won', _CHIPS), ('pot_index', _CHIPS),
+        ('pot', _POT), ('cards', _CARDS), ('handname', _HAND),
+        ('hand', _CARDLIST)),
+    RoundPublicOutId.ROUNDFINISHED: (),
+    RoundPublicOutId.ROUNDCLOSED: ()
+}
+PRIVATE_FIELDS = {
+    RoundPrivateOutId.DEALTCARDS: (('cards', _CARDS),)
+}
+
+def _putVarint(buffer, n):
+    if n < 0: raise ValueError(f'{n} is negative')
+    while n > 0x7f:
+        buffer.append(n & 0x7f | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+def _checkId(_id):
+    if not isinstance(_id, int) or _id < 0:
+        raise ValueError(f'id {_id!r} is not a non-negative integer')
+    return _id
+
+def _getVarint(data, i):
+    n = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80: return n, i
+        shift += 7
+
+def _putValue(buffer, kind, value):
+    if kind == _ID: _putVarint(buffer, _checkId(value))
+    elif kind == _CHIPS: _putVarint(buffer, value)
+    elif kind == _SIGNED: _putVarint(buffer, value << 1 ^ value >> 63)
+    elif kind == _TURN or kind == _HAND: buffer.append(value)
+    elif kind == _CARDS or kind == _CARDLIST:
+        buffer.append(len(value))
+        buffer.extend(toCompact(card) for card in value)
+    elif kind == _RANK: buffer.append(NO_RANK if value is None else value)
+    elif kind == _POT:
+        _putVarint(buffer, value.amount)
+        _putVarint(buffer, value.stake)
+        _putVarint(buffer, len(value.player_ids))
+        for _id in value.player_ids: _putVarint(buffer, _checkId(_id))
+
+def _getValue(data, i, kind, compact):
+    if kind <= _CHIPS: return _getVarint(data, i)
+    if kind == _SIGNED:
+        n, i = _getVarint(data, i)
+        return n >> 1 ^ -(n & 1), i
+    if kind == _TURN: return Turn(data[i]), i + 1
+    if kind == _HAND: return Hand(data[i]), i + 1
+    if kind == _CARDS or kind == _CARDLIST:
+        n = data[i]
+        cards = data[i+1:i+1+n]
+        cards = list(cards) if compact else [CARD_TUPLES[c] for c in cards]
+        return (cards if kind == _CARDLIST else tuple(cards)), i + 1 + n
+    if kind == _RANK:
+        return (None if data[i] == NO_RANK else Rank(data[i])), i + 1
+    if kind == _POT:
+        amount, i = _getVarint(data, i)
+        stake, i = _getVarint(data, i)
+        n, i = _getVarint(data, i)
+        ids = []
+        for _ in range(n):
+            _id, i = _getVarint(data, i)
+            ids.append(_id)
+        return Pot(amount, stake, tuple(ids)), i
+
+
+class HistoryWriter:
+    """
+    Writes round headers and outs to a binary file, in the history
+    format, buffering them until the buffer is full or flushed
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self._buffer = bytearray(MAGIC)
+        self._buffer.append(VERSION)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def flush(self):
+        self.file.write(self._buffer)
+        self._buffer = bytearray()
+        self.file.flush()
+
+    def _written(self):
+        if len(self._buffer) >= BUFFER_SIZE:
+            self.file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def _encode(self, encoder, *args):
+        # a record that fails to encode is dropped whole,
+        # so that the records before it can still be read
+        start = len(self._buffer)
+        try: encoder(self._buffer, *args)
+        except Exception:
+            del self._buffer[start:]
+            raise
+        self._written()
+
+    def writeRound(self, round):
+        """
+        Writes a header with the round's settings and starting stacks.
+        Ids that are not non-negative integers raise ValueError, here
+        and when writing outs.
+        """
+        self._encode(self._encodeRound, round)
+
+    def writePublicOut(self, out_id, data):
+        self._encode(self._encodePublicOut, out_id, data)
+
+    def writePrivateOut(self, player_id, out_id, data):
+        self._encode(self._encodePrivateOut, player_id, out_id, data)
+
+    @staticmethod
+    def _encodeRound(buffer, round):
+        buffer.append(ROUND_TAG)
+        _putVarint(buffer, 0 if round.id is None else _checkId(round.id) + 1)
+        buffer.append(bool(round.compact_cards))
+        _putVarint(buffer, round.small_blind)
+        _putVarint(buffer, round.big_blind)
+        _putVarint(buffer, round.button)
+        _putVarint(buffer, len(round.players))
+        for player in round.players:
+            _putVarint(buffer, _checkId(player.id))
+            _putVarint(buffer, player.money)
+
+    @staticmethod
+    def _encodePublicOut(buffer, out_id, data):
+        buffer.append(out_id)
+        for field, kind in PUBLIC_FIELDS[out_id]:
+            _putValue(buffer, kind, data[field])
+
+    @staticmethod
+    def _encodePrivateOut(buffer, player_id, out_id, data):
+        buffer.append(PRIVATE_TAG | out_id)
+        _putVarint(buffer, _checkId(player_id))
+        for field, kind in PRIVATE_FIELDS[out_id]:
+            _putValue(buffer, kind, data[field])
+
+
+class HistoryRound(Round):
+    """
+    Round that writes its outs, extended as in Round, to the history
+    writer, along with a header when it starts. Outs are written before
+    the out masks apply, so a silent round can still be recorded, while
+    a round without a writer drops masked outs before extending them.
+    """
+    history = None
+
+    def publicOut(self, out_id, **kwargs):
+        queued = self.public_out_mask >> out_id & 1
+        if self.history is None and not queued: return
+        kwargs.update(self.extendedPublicOut(out_id, kwargs))
+        if self.history is not None:
+            if out_id == RoundPublicOutId.NEWROUND:
+                self.history.writeRound(self)
+            self.history.writePublicOut(out_id, kwargs)
+        if queued:
+            self.public_out_queue.append(self.PublicOut(out_id, kwargs))
+
+    def privateOut(self, player_id, out_id, **kwargs):
+        queued = self.private_out_mask >> out_id & 1
+        if self.history is None and not queued: return
+        kwargs.update(self.extendedPrivateOut(player_id, out_id, kwargs))
+        if self.history is not None:
+            self.history.writePrivateOut(player_id, out_id, kwargs)
+        if queued:
+            self.private_out_queue.append(
+                self.PrivateOut(player_id, out_id, kwargs))
+
+
+def _decodeRecords(data):
+    if len(data) <= len(MAGIC) or bytes(data[:len(MAGIC)]) != MAGIC \
+            or data[len(MAGIC)] != VERSION:
+        raise ValueError('data is not in the history format')
+    i, n, compact = len(MAGIC) + 1, len(data), True
+    PublicOut, PrivateOut = Round.PublicOut, Round.PrivateOut
+    while i < n:
+        tag = data[i]
+        i += 1
+        if tag == ROUND_TAG:
+            round_id, i = _getVarint(data, i)
+            compact, i = bool(data[i]), i + 1
+            small_blind, i = _getVarint(data, i)
+            big_blind, i = _getVarint(data, i)
+            button, i = _getVarint(data, i)
+            nplayers, i = _getVarint(data, i)
+            players = []
+            for _ in range(nplayers):
+                _id, i = _getVarint(data, i)
+                money, i = _getVarint(data, i)
+                players.append((_id, money))
+            yield RoundHeader(
+                None if round_id == 0 else round_id - 1, compact,
+                small_blind, big_blind, button, tuple(players))
+        elif tag & PRIVATE_TAG:
+            out_id = RoundPrivateOutId(tag ^ PRIVATE_TAG)
+            player_id, i = _getVarint(data, i)
+            out = {}
+            for field, kind in PRIVATE_FIELDS[out_id]:
+                out[field], i = _getValue(data, i, kind, compact)
+            yield PrivateOut(player_id, out_id, out)
+        else:
+            out_id = RoundPublicOutId(tag)
+            out = {}
+            for field, kind in PUBLIC_FIELDS[out_id]:
+                out[field], i = _getValue(data, i, kind, compact)
+            yield PublicOut(out_id, out)
+
+def readHistory(source):
+    """
+    Lazily decodes the records of a history, given as a path, a binary
+    file, or a bytes-like object such as an mmap. Files that have a file
+    descriptor are memory mapped, others are read whole. Round headers are
+    yielded as RoundHeader, outs as Round's PublicOut and PrivateOut,
+    with cards in the form the round dealt them. Cards dealt as
+    [rank, suit] lists are read back as (rank, suit) tuples.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from readHistory(file)
+    elif hasattr(source, 'read'):
+        try: fileno = source.fileno()
+        except (AttributeError, io.UnsupportedOperation): fileno = None
+        # mmap can't map an empty file, which is read as empty data
+        if fileno is None or os.fstat(fileno).st_size == 0:
+            yield from _decodeRecords(source.read())
+        else:
+            with mmap(fileno, 0, access=ACCESS_READ) as data:
+                yield from _decodeRecords(data)
+    else: yield from _decodeRecords(source)
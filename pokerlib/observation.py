@@ -0,0 +1,118 @@
+from array import array
+
+from .cards import toCompact
+
+# sizes of the observation's parts, that don't depend on the number of seats
+NCARDS = 52
+NTURNS = 4
+NLEGAL = 5
+
+class ObservationEncoder:
+    """
+    Encodes rounds, as seen by one of their players, into float32 vectors
+    of a fixed layout, written into buffers given by the caller. Seats are
+    listed starting with the observing player's and following the table
+    order, seats a round doesn't fill are zero, and chips are in big
+    blinds. Each part of the layout starts at the offset given by the
+    encoder's attribute of the same name:
+
+        hole       52      hole cards, one-hot by compact card
+        board      52      board cards, one-hot by compact card
+        street     4       current turn, one-hot
+        stacks     n       money of the seats
+        stakes     4 * n   stakes of the seats on each street, by seat
+        button     n       seat of the button, one-hot
+        folded     n       folded seats
+        all_in     n       seats that are all-in
+        pot        1       chips in the pot
+        to_call    1       chips the player has to call
+        legal      5       legal FOLD, CHECK, CALL, RAISE and ALLIN
+                           actions, when the player is to act
+
+    A buffer is any writable C-contiguous float32 buffer, such as a numpy
+    array, of size floats for encode and (N, size) floats for encodeBatch.
+    """
+
+    def __init__(self, nseats):
+        self.nseats = n = nseats
+        self.hole = 0
+        self.board = self.hole + NCARDS
+        self.street = self.board + NCARDS
+        self.stacks = self.street + NTURNS
+        self.stakes = self.stacks + n
+        self.button = self.stakes + NTURNS * n
+        self.folded = self.button + n
+        self.all_in = self.folded + n
+        self.pot = self.all_in + n
+        self.to_call = self.pot + 1
+        self.legal = self.to_call + 1
+        self.size = self.legal + NLEGAL
+        self._zeros = memoryview(array('f', bytes(4 * self.size)))
+
+    def encode(self, round, out, player_id=None):
+        """Encodes the round as seen by the player, or the player to act"""
+        view = memoryview(out).cast('B')
+        if len(view) != 4 * self.size:
+            raise ValueError(f'out should hold {self.size} floats')
+        self._write(view.cast('f'), 0, round, player_id)
+
+    def encodeBatch(self, rounds, out, player_ids=None):
+        """
+        Encodes the i-th round as seen by the i-th player, or the player
+        to act, into the i-th row of out
+        """
+        view = memoryview(out).cast('B')
+        if len(view) != 4 * self.size * len(rounds):
+            raise ValueError(
+                f'out should hold {len(rounds)} rows of {self.size} floats')
+        view = view.cast('f')
+        for i, round in enumerate(rounds):
+            player_id = None if player_ids is None else player_ids[i]
+            self._write(view, i * self.size, round, player_id)
+
+    def _write(self, view, base, round, player_id):
+        players = round.players
+        n = len(players)
+        if n > self.nseats:
+            raise ValueError(f'round has more than {self.nseats} seats')
+        if player_id is None:
+            player = round.current_player
+            index = round.current_index
+        else:
+            index = players.getSeatIndex(player_id)
+            player = players[index]
+
+        view[base:base+self.size] = self._zeros
+        scale = 1 / round.big_blind
+
+        for card in player.cards:
+            view[base + self.hole + toCompact(card)] = 1
+        for card in round.board:
+            view[base + self.board + toCompact(card)] = 1
+        view[base + self.street + round.turn] = 1
+
+        stacks, stakes = base + self.stacks, base + self.stakes
+        folded, all_in = base + self.folded, base + self.all_in
+        for j in range(n):
+            seat_player = players[(index + j) % n]
+            view[stacks + j] = seat_player.money * scale
+            turn_stake = seat_player.turn_stake
+            k = stakes + NTURNS * j
+            view[k] = turn_stake[0] * scale
+            view[k + 1] = turn_stake[1] * scale
+            view[k + 2] = turn_stake[2] * scale
+            view[k + 3] = turn_stake[3] * scale
+            if seat_player.is_folded: view[folded + j] = 1
+            if seat_player.is_all_in: view[all_in + j] = 1
+        view[base + self.button + (round.button - index) % n] = 1
+        view[base + self.pot] = sum(round._pot_sizes) * scale
+
+        if round.finished: return
+        to_call = round._turn_stakes[round.turn] - player.turn_stake[round.turn]
+        view[base + self.to_call] = to_call * scale
+        if index == round.current_index:
+            legal = base + self.legal
+            view[legal] = 1
+            view[legal + (2 if to_call else 1)] = 1
+            if to_call < player.money: view[legal + 3] = 1
+            view[legal + 4] = 1
@@ -0,0 +1,146 @@
+from bisect import bisect_left
+from collections import namedtuple
+
+from .enums import Turn, RoundPublicInId, RoundPublicOutId, RoundPrivateOutId
+from .history import RoundHeader
+from ._player import Player, PlayerGroup
+from ._round import Round
+
+# A round's log holds its settings, the players' ids with their money
+# at the start of the round (or None where it follows from the previous
+# round), its deck in the order cards are dealt, and its actions as
+# (player_id, action, raise_by) triples in the order they were taken.
+RoundLog = namedtuple('RoundLog', [
+    'round_id', 'button', 'small_blind', 'big_blind',
+    'players', 'deck', 'actions', 'compact_cards'
+])
+
+# outs that record an action, and the action they record
+ACTION_OUTS = {
+    RoundPublicOutId.PLAYERFOLD: RoundPublicInId.FOLD,
+    RoundPublicOutId.PLAYERCHECK: RoundPublicInId.CHECK,
+    RoundPublicOutId.PLAYERCALL: RoundPublicInId.CALL,
+    RoundPublicOutId.PLAYERRAISE: RoundPublicInId.RAISE,
+    RoundPublicOutId.PLAYERWENTALLIN: RoundPublicInId.ALLIN,
+    RoundPublicOutId.PLAYERREVEALCARDS: RoundPublicInId.SHOW,
+    RoundPublicOutId.PLAYERMUCKCARDS: RoundPublicInId.MUCK
+}
+
+def roundLogs(records):
+    """
+    Round logs rebuilt from history records, as read with readHistory.
+    The deck is made of the dealt hole cards followed by the board,
+    so it is complete for as long as the recorded round went on.
+    """
+    log = None
+    for record in records:
+        if isinstance(record, RoundHeader):
+            if log is not None: yield log
+            log = RoundLog(
+                record.round_id, record.button, record.small_blind,
+                record.big_blind, record.players, [], [],
+                record.compact_cards
+            )
+            board = []
+        elif log is None: continue
+        elif isinstance(record, Round.PrivateOut):
+            if record.id == RoundPrivateOutId.DEALTCARDS:
+                log.deck.extend(record.data['cards'])
+        elif record.id == RoundPublicOutId.NEWTURN:
+            if record.data['turn'] == Turn.PREFLOP: continue
+            new_cards = record.data['board'][len(board):]
+            board.extend(new_cards)
+            log.deck.extend(new_cards)
+        elif record.id in ACTION_OUTS:
+            log.actions.append((
+                record.data['player_id'], ACTION_OUTS[record.id],
+                record.data.get('raised_by', 0)
+            ))
+    if log is not None: yield log
+
+
+class ReplayRound(Round):
+    """
+    Round dealt from a fixed deck, that builds no outs. Actions are
+    validated and applied the same as in Round.
+    """
+    public_out_mask = 0
+    private_out_mask = 0
+
+    def __init__(self, _id, players, button, small_blind, big_blind, deck):
+        self._fixed_deck = deck
+        super().__init__(_id, players, button, small_blind, big_blind)
+
+    def _deckIterator(self):
+        return iter(self._fixed_deck)
+
+
+def replayRound(log, stacks=None, nactions=None):
+    """
+    Round rebuilt from its log, after its first nactions actions (or all
+    of them), where stacks maps player ids to money not given in the log
+    """
+    players = PlayerGroup([
+        Player(None, _id, str(_id), stacks[_id] if money is None else money)
+        for _id, money in log.players
+    ])
+    round = ReplayRound(
+        log.round_id, players, log.button,
+        log.small_blind, log.big_blind, log.deck
+    )
+    for player_id, action, raise_by in log.actions[:nactions]:
+        round.publicIn(player_id, action, raise_by=raise_by)
+    return round
+
+
+class Replay:
+    """
+    Session of round logs, whose state can be rebuilt after any number
+    of actions. Stacks missing from a log follow from replaying earlier
+    rounds, and are kept as snapshots every snapshot_interval rounds,
+    so seeking replays at most that many rounds once snapshots exist.
+    """
+
+    def __init__(self, logs, snapshot_interval=64):
+        self.logs = list(logs)
+        self.snapshot_interval = snapshot_interval
+        self._offsets, total = [], 0
+        for log in self.logs:
+            self._offsets.append(total)
+            total += len(log.actions)
+        self.nactions = total
+        # money of every seated player at the start of a round
+        self._snapshots = {}
+
+    def __len__(self):
+        return self.nactions
+
+    def _isComplete(self, r):
+        return all(money is not None for _, money in self.logs[r].players)
+
+    def roundStacks(self, r):
+        """Money of the players at the start of the r-th round"""
+        if r in self._snapshots: return self._snapshots[r]
+        start = r
+        while start > 0 and start not in self._snapshots \
+                and not self._isComplete(start):
+            start -= 1
+        stacks = self._snapshots.get(start, {})
+        for i in range(start, r):
+            round = replayRound(self.logs[i], stacks)
+            stacks = dict(stacks)
+            stacks.update((player.id, player.money) for player in round.players)
+            if (i + 1) % self.snapshot_interval == 0:
+                self._snapshots[i + 1] = stacks
+        return stacks
+
+    def seek(self, k):
+        """
+        Round in which the k-th action of the session was taken, after
+        that action, or the first round before any action when k is 0
+        """
+        if not 0 <= k <= self.nactions:
+            raise ValueError(f'action {k} is not in the session')
+        r = max(bisect_left(self._offsets, k) - 1, 0)
+        stacks = {} if self._isComplete(r) else self.roundStacks(r)
+        return replayRound(self.logs[r], stacks, k - self._offsets[r])
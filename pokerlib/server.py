@@ -0,0 +1,200 @@
+import asyncio
+from collections import namedtuple, deque
+
+from ._table import Table
+from .enums import TablePrivateOutId
+
+# an event is a table's public out, with player_id None,
+# or a private out to the player with player_id
+TableEvent = namedtuple('TableEvent', ['table_id', 'player_id', 'id', 'data'])
+
+# sent to a table's action queue to stop its task
+_CLOSED = object()
+
+class ServedTable(Table):
+    """Table that keeps its outs as events, for the server to dispatch"""
+
+    def __init__(self, *args):
+        self.events = []
+        super().__init__(*args)
+
+    def publicOut(self, out_id, **kwargs):
+        self.events.append(TableEvent(self.id, None, out_id, kwargs))
+
+    def privateOut(self, player_id, out_id, **kwargs):
+        self.events.append(TableEvent(self.id, player_id, out_id, kwargs))
+
+
+class EventStream:
+    """
+    Async iterator over a table's events, buffered up to maxsize events.
+    When the buffer is full, the table waits for it to be consumed.
+    Events buffered before the stream is closed are still iterated over.
+    """
+
+    def __init__(self, subscribers, maxsize):
+        self.maxsize = maxsize
+        self.closed = False
+        self._subscribers = subscribers
+        self._events = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        subscribers.append(self)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._events:
+            if self.closed: raise StopAsyncIteration
+            self._readable.clear()
+            await self._readable.wait()
+        event = self._events.popleft()
+        self._writable.set()
+        return event
+
+    def close(self):
+        """Unsubscribes the stream, so that it stops holding up the table"""
+        if self in self._subscribers: self._subscribers.remove(self)
+        self.closed = True
+        self._readable.set()
+        self._writable.set()
+
+    async def _put(self, event):
+        while len(self._events) >= self.maxsize and not self.closed:
+            self._writable.clear()
+            await self._writable.wait()
+        if self.closed: return
+        self._events.append(event)
+        self._readable.set()
+
+
+class _HostedTable:
+
+    def __init__(self, table, queue_size):
+        self.table = table
+        self.actions = asyncio.Queue(queue_size)
+        self.public_streams = []
+        self.private_streams = {}
+        self.task = None
+
+
+class TableServer:
+    """
+    Hosts ServedTables on one event loop, each played by its own task
+    that takes actions from a bounded queue. Clients send actions with
+    send, and read a table's public events, or a player's private events,
+    from event streams. Sending waits while a table's action queue is
+    full, and a table waits while any of its streams is full.
+    """
+
+    def __init__(self, queue_size=64, stream_size=256):
+        self.queue_size = queue_size
+        self.stream_size = stream_size
+        self._tables = {}
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, table_id):
+        return table_id in self._tables
+
+    def addTable(self, table):
+        """Starts hosting the table, in the running event loop"""
+        if table.id in self._tables:
+            raise ValueError(f'table {table.id} is already hosted')
+        hosted = _HostedTable(table, self.queue_size)
+        hosted.task = asyncio.get_running_loop().create_task(
+            self._playTable(hosted))
+        self._tables[table.id] = hosted
+
+    async def removeTable(self, table_id):
+        """
+        Stops hosting the table, after the actions sent to it are taken
+        and their events are buffered, and ends its event streams. Raises
+        ValueError if the table's task has already ended.
+        """
+        hosted = self._getHosted(table_id)
+        try: await self._queue(hosted, _CLOSED)
+        finally: del self._tables[table_id]
+        await hosted.task
+        return hosted.table
+
+    async def close(self):
+        for table_id in list(self._tables):
+            await self.removeTable(table_id)
+
+    def getTable(self, table_id):
+        return self._getHosted(table_id).table
+
+    async def send(self, table_id, player_id, action, **kwargs):
+        """
+        Queues the action, as it would be passed to Table.publicIn. An
+        action that raises is reported to the player as an ACTIONFAILED
+        private event, or as a public one when player_id is None.
+        """
+        hosted = self._getHosted(table_id)
+        await self._queue(hosted, (player_id, action, kwargs))
+
+    def publicEvents(self, table_id):
+        """Stream of the table's public events, from now on"""
+        hosted = self._getHosted(table_id)
+        return EventStream(hosted.public_streams, self.stream_size)
+
+    def privateEvents(self, table_id, player_id):
+        """Stream of the player's private events at the table, from now on"""
+        hosted = self._getHosted(table_id)
+        streams = hosted.private_streams.setdefault(player_id, [])
+        return EventStream(streams, self.stream_size)
+
+    def _getHosted(self, table_id):
+        hosted = self._tables.get(table_id)
+        if hosted is None:
+            raise ValueError(f'table {table_id} is not hosted')
+        return hosted
+
+    async def _queue(self, hosted, item):
+        # a table whose task has ended won't take its queued actions
+        if hosted.task.done():
+            raise ValueError(f'table {hosted.table.id} is no longer played')
+        if not hosted.actions.full(): return hosted.actions.put_nowait(item)
+        put = asyncio.ensure_future(hosted.actions.put(item))
+        await asyncio.wait(
+            [put, hosted.task], return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            raise ValueError(f'table {hosted.table.id} is no longer played')
+
+    async def _playTable(self, hosted):
+        table = hosted.table
+        try:
+            await self._dispatch(hosted)
+            while True:
+                action = await hosted.actions.get()
+                if action is _CLOSED: break
+                player_id, action, kwargs = action
+                try: table.publicIn(player_id, action, **kwargs)
+                except Exception as error:
+                    table.privateOut(
+                        player_id, TablePrivateOutId.ACTIONFAILED,
+                        table_id=table.id, action=action, error=repr(error))
+                await self._dispatch(hosted)
+                # let other tables play between queued actions
+                if not hosted.actions.empty(): await asyncio.sleep(0)
+        finally:
+            for stream in hosted.public_streams[:]: stream.close()
+            for streams in hosted.private_streams.values():
+                for stream in streams[:]: stream.close()
+
+    async def _dispatch(self, hosted):
+        events = hosted.table.events
+        if not events: return
+        hosted.table.events = []
+        for event in events:
+            if event.player_id is None: streams = hosted.public_streams
+            else: streams = hosted.private_streams.get(event.player_id, ())
+            for stream in streams[:]:
+                await stream._put(event)
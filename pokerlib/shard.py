@@ -0,0 +1,318 @@
+import pickle
+from zlib import crc32
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+from .enums import RoundPublicOutId, TablePrivateOutId
+from .server import TableEvent
+
+# Messages to a shard are tuples starting with their kind, a shard
+# replies with (_EVENTS, events) for the events of its tables, and with
+# (_REPLY, value) to messages that expect a reply, or (_ERROR, error)
+# when they fail. Other failed messages are reported as events.
+_ACT, _ADD, _REMOVE, _CLOSE = range(4)
+_EVENTS, _REPLY, _ERROR = range(3)
+_REPLIED = (_REMOVE, _CLOSE)
+
+class ShardWorker:
+    """Tables of one shard, that take the messages routed to them"""
+
+    def __init__(self):
+        self.tables = {}
+        self.events = []
+
+    def handle(self, message):
+        """Takes the message, and returns the reply if it expects one"""
+        kind = message[0]
+        if kind == _ACT:
+            _, table_id, player_id, action, kwargs = message
+            table = self.tables[table_id]
+            table.publicIn(player_id, action, **kwargs)
+            self._takeEvents(table)
+        elif kind == _ADD:
+            table = message[1]
+            self.tables[table.id] = table
+            self._takeEvents(table)
+        elif kind == _REMOVE:
+            # only tables between rounds can be moved, as rounds in play
+            # hold generators, and a closed round is dropped
+            table = self.tables.get(message[1])
+            if table is None or table.round: return None
+            del self.tables[table.id]
+            table.round = None
+            return table
+        elif kind == _CLOSE:
+            return len(self.tables)
+
+    def respond(self, message):
+        """
+        Takes the message, and returns the reply to send back if it
+        expects one, failures of other messages become ACTIONFAILED events
+        """
+        try: reply = self.handle(message)
+        except Exception as error:
+            if message[0] in _REPLIED: return _ERROR, repr(error)
+            self._failed(message, error)
+            return None
+        if message[0] in _REPLIED: return _REPLY, reply
+
+    def _failed(self, message, error):
+        if message[0] == _ACT:
+            _, table_id, player_id, action, _ = message
+        else: table_id, player_id, action = message[1].id, None, None
+        self.events.append(TableEvent(
+            table_id, player_id, TablePrivateOutId.ACTIONFAILED,
+            {'table_id': table_id, 'action': action, 'error': repr(error)}
+        ))
+
+    def _takeEvents(self, table):
+        if table.events:
+            self.events.extend(table.events)
+            table.events = []
+
+    def flush(self):
+        events, self.events = self.events, []
+        return events
+
+
+def _runWorker(connection):
+    worker = ShardWorker()
+    while True:
+        # messages that are already waiting are taken together,
+        # so that their events are sent back in one batch
+        message = connection.recv()
+        while True:
+            reply = worker.respond(message)
+            if reply is not None:
+                if worker.events: connection.send((_EVENTS, worker.flush()))
+                connection.send(reply)
+                if message[0] == _CLOSE: return connection.close()
+            if not connection.poll(): break
+            message = connection.recv()
+        if worker.events: connection.send((_EVENTS, worker.flush()))
+
+
+class ProcessTransport:
+    """Runs a shard's worker in a child process, connected by a pipe"""
+
+    def __init__(self):
+        self.connection, child = Pipe()
+        self.process = Process(target=_runWorker, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, message):
+        self.connection.send(message)
+
+    def recv(self):
+        return self.connection.recv()
+
+    def poll(self):
+        return self.connection.poll()
+
+    def close(self):
+        self.connection.close()
+        self.process.join()
+
+
+class LocalTransport:
+    """
+    Runs a shard's worker in this process, for testing, pickling
+    messages and replies as a pipe would
+    """
+    connection = None
+
+    def __init__(self):
+        self.worker = ShardWorker()
+        self._replies = deque()
+
+    def send(self, message):
+        message = pickle.loads(pickle.dumps(message))
+        reply = self.worker.respond(message)
+        if self.worker.events:
+            self._put((_EVENTS, self.worker.flush()))
+        if reply is not None: self._put(reply)
+
+    def recv(self):
+        return self._replies.popleft()
+
+    def poll(self):
+        return bool(self._replies)
+
+    def close(self):
+        pass
+
+    def _put(self, reply):
+        self._replies.append(pickle.loads(pickle.dumps(reply)))
+
+
+class TableManager:
+    """
+    Shards ServedTables across workers, each behind its own transport,
+    by table id. Actions sent to a table are routed to its worker, and
+    the events of all tables are collected with poll. Workers can be
+    added, and drained, which moves their tables to the other workers
+    once the tables are between rounds. Tables between rounds can also
+    be moved explicitly. Transports are ProcessTransport by default,
+    LocalTransport runs the workers in this process. Actions that raise
+    are reported as ACTIONFAILED events, and leave the worker running.
+    """
+
+    def __init__(self, nworkers=2, transport=ProcessTransport):
+        self.transport = transport
+        self.workers = {}
+        self.shards = {}
+        self.draining = set()
+        self._next_worker_id = 0
+        self._events = []
+        for _ in range(nworkers): self.addWorker()
+
+    def __len__(self):
+        return len(self.shards)
+
+    def __contains__(self, table_id):
+        return table_id in self.shards
+
+    def addWorker(self):
+        """Starts a worker, that new tables can be placed on"""
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        self.workers[worker_id] = self.transport()
+        return worker_id
+
+    def drainWorker(self, worker_id):
+        """
+        Stops placing tables on the worker and moves its tables away,
+        those in a round are moved once it closes. The worker is closed
+        when it has no tables left, which is returned as True.
+        """
+        self._getWorker(worker_id)
+        if not self._liveWorkers(exclude=worker_id):
+            raise ValueError('no other worker to move tables to')
+        self.draining.add(worker_id)
+        for table_id in self.workerTables(worker_id):
+            self._tryMove(table_id, self._placement(table_id))
+        return self._closeDrained(worker_id)
+
+    def workerTables(self, worker_id):
+        return [
+            table_id for table_id, shard in self.shards.items()
+            if shard == worker_id
+        ]
+
+    def addTable(self, table, worker_id=None):
+        """Places the table on the given worker, or by its id"""
+        if table.id in self.shards:
+            raise ValueError(f'table {table.id} is already managed')
+        if worker_id is None: worker_id = self._placement(table.id)
+        self._getWorker(worker_id).send((_ADD, table))
+        self.shards[table.id] = worker_id
+
+    def removeTable(self, table_id):
+        """Removes the table, which has to be between rounds, and returns it"""
+        table = self._request(self._getShard(table_id), (_REMOVE, table_id))
+        if table is None:
+            raise ValueError(f'table {table_id} is in a round')
+        del self.shards[table_id]
+        return table
+
+    def moveTable(self, table_id, worker_id):
+        """Moves the table, which has to be between rounds, to the worker"""
+        self._getWorker(worker_id)
+        if not self._tryMove(table_id, worker_id):
+            raise ValueError(f'table {table_id} is in a round')
+
+    def send(self, table_id, player_id, action, **kwargs):
+        """Routes the action, as it would be passed to Table.publicIn"""
+        self._getWorker(self._getShard(table_id)).send(
+            (_ACT, table_id, player_id, action, kwargs))
+
+    def poll(self, timeout=0):
+        """
+        Events received from the workers, waiting up to timeout seconds
+        for some to arrive when there are none
+        """
+        self._receive()
+        if not self._events and timeout:
+            connections = [
+                transport.connection for transport in self.workers.values()
+                if transport.connection is not None
+            ]
+            if wait(connections, timeout): self._receive()
+        events, self._events = self._events, []
+        for event in events:
+            if event.id is RoundPublicOutId.ROUNDCLOSED:
+                self._roundClosed(event.table_id)
+        return events
+
+    def close(self):
+        """Closes the workers, their tables' last events are kept for poll"""
+        for worker_id in list(self.workers):
+            self._request(worker_id, (_CLOSE,))
+            self.workers.pop(worker_id).close()
+        self.shards.clear()
+        self.draining.clear()
+
+    def _getWorker(self, worker_id):
+        transport = self.workers.get(worker_id)
+        if transport is None:
+            raise ValueError(f'worker {worker_id} is not running')
+        return transport
+
+    def _getShard(self, table_id):
+        worker_id = self.shards.get(table_id)
+        if worker_id is None:
+            raise ValueError(f'table {table_id} is not managed')
+        return worker_id
+
+    def _liveWorkers(self, exclude=None):
+        return [
+            worker_id for worker_id in self.workers
+            if worker_id not in self.draining and worker_id != exclude
+        ]
+
+    def _placement(self, table_id):
+        workers = self._liveWorkers()
+        if not workers: raise ValueError('no worker to place tables on')
+        # hash() of strings differs between processes, crc32 doesn't
+        return workers[crc32(repr(table_id).encode()) % len(workers)]
+
+    def _request(self, worker_id, message):
+        # events received before the reply are kept for poll
+        transport = self._getWorker(worker_id)
+        transport.send(message)
+        while True:
+            kind, data = transport.recv()
+            if kind == _REPLY: return data
+            if kind == _ERROR:
+                raise ValueError(f'worker {worker_id} failed with {data}')
+            self._events.extend(data)
+
+    def _receive(self):
+        for transport in self.workers.values():
+            while transport.poll():
+                kind, data = transport.recv()
+                self._events.extend(data)
+
+    def _tryMove(self, table_id, worker_id):
+        source = self._getShard(table_id)
+        if source == worker_id: return True
+        table = self._request(source, (_REMOVE, table_id))
+        if table is None: return False
+        self._getWorker(worker_id).send((_ADD, table))
+        self.shards[table_id] = worker_id
+        return True
+
+    def _roundClosed(self, table_id):
+        worker_id = self.shards.get(table_id)
+        if worker_id in self.draining:
+            self._tryMove(table_id, self._placement(table_id))
+            self._closeDrained(worker_id)
+
+    def _closeDrained(self, worker_id):
+        if self.workerTables(worker_id): return False
+        self._request(worker_id, (_CLOSE,))
+        self.workers.pop(worker_id).close()
+        self.draining.discard(worker_id)
+        return True
@@ -0,0 +1,229 @@
+from time import perf_counter
+from random import Random
+from collections import namedtuple
+
+from . import _lookup
+from .enums import Turn, RoundPublicInId
+from .cards import DECK
+from ._lookup import COMPACT_KEYS, KEYSTART, sharedStrengths
+from ._pots import stakePots, splitPot
+
+FOLD = RoundPublicInId.FOLD
+CHECK = RoundPublicInId.CHECK
+CALL = RoundPublicInId.CALL
+RAISE = RoundPublicInId.RAISE
+ALLIN = RoundPublicInId.ALLIN
+
+SimStats = namedtuple(
+    'SimStats', ['hands', 'winnings', 'seconds', 'hands_per_second'])
+
+def passivePolicy(sim, seat):
+    """Checks when it can, calls otherwise"""
+    return CALL if sim.to_call else CHECK
+
+def randomPolicy(max_raise=None, rng=None):
+    """Policy that folds, calls or raises by up to max_raise at random"""
+    rng = rng or Random()
+    def policy(sim, seat):
+        r = rng.random()
+        if r < 0.2 and sim.to_call: return FOLD
+        if r < 0.8: return CALL if sim.to_call else CHECK
+        return RAISE, rng.randint(1, max_raise or 2 * sim.big_blind)
+    return policy
+
+
+class Simulator:
+    """
+    Plays rounds between policies without building any events, with the
+    same betting, blinds and pot splitting as Round. A policy is called
+    as policy(sim, seat) and returns an action, or a (RAISE, raise_by)
+    pair. The simulator's attributes describe the round to the policy.
+    A check facing a bet folds, and calls or raises that a player can't
+    cover are all-ins. Every hand starts with the same stacks, and the
+    button moves by a seat after each hand.
+    """
+
+    def __init__(self, policies, stack=1000, small_blind=5, big_blind=10,
+                 seed=None):
+        self.policies = list(policies)
+        self.nseats = len(self.policies)
+        if self.nseats < 2:
+            raise ValueError('at least two policies are needed')
+        self.stack = stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.button = 0
+        self.hands = 0
+        self.winnings = [0] * self.nseats
+        self.seconds = 0.0
+        self._random = Random(seed)
+        if _lookup._rank_table is None: _lookup._buildTables()
+
+    def stats(self):
+        hands_per_second = self.hands / self.seconds if self.seconds else 0.0
+        return SimStats(
+            self.hands, list(self.winnings), self.seconds, hands_per_second)
+
+    def run(self, nhands):
+        """Plays nhands rounds and returns the aggregate stats"""
+        start = perf_counter()
+        for _ in range(nhands): self._playHand()
+        self.seconds += perf_counter() - start
+        return self.stats()
+
+    def playHand(self):
+        """Plays one round and returns each seat's net winnings"""
+        start = perf_counter()
+        won = self._playHand()
+        self.seconds += perf_counter() - start
+        return won
+
+    def _deal(self):
+        n = self.nseats
+        deck = self._random.sample(DECK, 2 * n + 5)
+        self.holes = [deck[2*i:2*i+2] for i in range(n)]
+        self._board_cards = deck[2*n:]
+
+    def _playHand(self):
+        n = self.nseats
+        self._deal()
+        stacks = self.stack if isinstance(self.stack, list) else [self.stack] * n
+        self.stacks = list(stacks)
+        self.stakes = [0] * n
+        self.folded = [False] * n
+        self.all_in = [False] * n
+        self.board = []
+        self.pot = 0
+        self._nactive = self._nunfolded = n
+
+        self._newTurn(Turn.PREFLOP)
+        self._pay((self.button + 1) % n, self.small_blind)
+        self._pay((self.button + 2) % n, self.big_blind)
+        while not self._stateUpdate():
+            self._current = self._nextActive(self._current)
+            self._act(self._current)
+
+        won = [self.stacks[i] - stacks[i] for i in range(n)]
+        for i in range(n): self.winnings[i] += won[i]
+        self.hands += 1
+        self.button = (self.button + 1) % n
+        return won
+
+    def _newTurn(self, turn):
+        self.turn = turn
+        self.board = self._board_cards[:(0, 3, 4, 5)[turn]]
+        self.turn_stakes = [0] * self.nseats
+        self.turn_stake = 0
+        self.played = [False] * self.nseats
+        self._nunplayed = self._nmatched = self._nactive
+        # the seat before the first to act
+        self._current = (self.button + 2) % self.nseats \
+            if turn == Turn.PREFLOP else self.button
+
+    def _nextActive(self, i):
+        n, folded, all_in = self.nseats, self.folded, self.all_in
+        for k in range(i + 1, i + n):
+            k %= n
+            if not (folded[k] or all_in[k]): return k
+
+    def _pay(self, seat, amount):
+        was_matched = self.turn_stakes[seat] == self.turn_stake
+        if amount < self.stacks[seat]:
+            self.stacks[seat] -= amount
+        else:
+            amount = self.stacks[seat]
+            self.stacks[seat] = 0
+            self.all_in[seat] = True
+            self._nactive -= 1
+            if not self.played[seat]: self._nunplayed -= 1
+        self.stakes[seat] += amount
+        self.turn_stakes[seat] += amount
+        self.pot += amount
+
+        # number of active players that staked the largest amount
+        stake = self.turn_stakes[seat]
+        is_active = not self.all_in[seat]
+        if stake > self.turn_stake:
+            self.turn_stake = stake
+            self._nmatched = 1 if is_active else 0
+        elif was_matched and not is_active:
+            self._nmatched -= 1
+        elif not was_matched and is_active and stake == self.turn_stake:
+            self._nmatched += 1
+
+    def _fold(self, seat):
+        self.folded[seat] = True
+        self._nactive -= 1
+        self._nunfolded -= 1
+        if self.turn_stakes[seat] == self.turn_stake: self._nmatched -= 1
+        if not self.played[seat]: self._nunplayed -= 1
+
+    def _act(self, seat):
+        to_call = self.turn_stake - self.turn_stakes[seat]
+        self.to_call = to_call
+        action = self.policies[seat](self, seat)
+        raise_by = 0
+        if type(action) is tuple: action, raise_by = action
+
+        if action == CALL: self._pay(seat, to_call)
+        elif action == CHECK:
+            if to_call: self._fold(seat)
+        elif action == FOLD: self._fold(seat)
+        elif action == RAISE: self._pay(seat, to_call + max(raise_by, 0))
+        elif action == ALLIN: self._pay(seat, self.stacks[seat])
+        else: raise ValueError(f'{action} is not a betting action')
+
+        if not self.played[seat]:
+            self.played[seat] = True
+            if not (self.folded[seat] or self.all_in[seat]):
+                self._nunplayed -= 1
+
+    def _stateUpdate(self):
+        # the same conditions, in the same order, as Round's update
+        balanced = self._nmatched == self._nactive
+        if self._nunfolded == 1:
+            self._dealPrematureWinnings()
+            return True
+        if self._nactive <= 1 and balanced:
+            self.board = self._board_cards
+            self._dealWinnings()
+            return True
+        if balanced and self._nunplayed == 0:
+            if self.turn == Turn.RIVER:
+                self._dealWinnings()
+                return True
+            self._newTurn(Turn(self.turn + 1))
+        return False
+
+    def _dealPrematureWinnings(self):
+        winner = self.folded.index(False)
+        self.stacks[winner] += self.pot
+
+    def _dealWinnings(self):
+        n, board = self.nseats, self.board
+        board_key = KEYSTART
+        for card in board: board_key += COMPACT_KEYS[card]
+        seats = [i for i in range(n) if not self.folded[i]]
+        holes = [self.holes[i] for i in seats]
+        strengths = dict(zip(seats, sharedStrengths(
+            board, board_key, holes,
+            [COMPACT_KEYS[a] + COMPACT_KEYS[b] for a, b in holes]
+        )))
+
+        # without all-ins short of the largest stake there are no side
+        # pots, and odd chips go to the winners closest to the button's left
+        stake = max(self.stakes)
+        if all(self.stakes[i] == stake for i in seats):
+            pots = [(self.pot, seats)]
+        else: pots = [
+            (pot.amount, pot.player_ids)
+            for pot in stakePots(self.stakes, self.folded, range(n))
+        ]
+        button = self.button
+        for amount, contenders in pots:
+            best = max(strengths[i] for i in contenders)
+            winners = [i for i in contenders if strengths[i] == best]
+            if len(winners) > 1:
+                winners.sort(key = lambda i: (i - button - 1) % n)
+            for i, won in zip(winners, splitPot(amount, winners)):
+                self.stacks[i] += won
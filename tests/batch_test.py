@@ -0,0 +1,33 @@
+import sys
+sys.path.append('../pokerlib')
+
+import numpy as np
+from pokerlib.batch import evaluateBatch
+from pokerlib.enums import Hand
+from pokerlib.cards import DECK
+from pokerlib._lookup import evaluate
+
+rng = np.random.default_rng(0)
+
+for ncards in (5, 6, 7):
+    hands = np.array([rng.permutation(52)[:ncards] for _ in range(20000)])
+    strengths, categories = evaluateBatch(hands)
+    assert strengths.shape == categories.shape == (len(hands),)
+    for hand, strength, category in zip(hands, strengths, categories):
+        assert strength == evaluate(hand.tolist())
+        assert Hand(category) == Hand(strength >> 20)
+
+# royal flush, quads, and a wheel
+strengths, categories = evaluateBatch([
+    [48, 44, 40, 36, 32, 0, 1],
+    [48, 49, 50, 51, 0, 4, 8],
+    [48, 1, 6, 11, 12, 30, 33]
+])
+assert list(categories) == [
+    Hand.STRAIGHTFLUSH, Hand.FOUROFAKIND, Hand.STRAIGHT]
+assert strengths[0] > strengths[1] > strengths[2]
+
+try:
+    evaluateBatch(np.zeros((3, 8), dtype=int))
+except ValueError: pass
+else: assert False
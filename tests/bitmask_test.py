@@ -0,0 +1,59 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import sample
+from itertools import product
+from pokerlib import HandParser, BitmaskHandParser, Round, Player, PlayerGroup
+from pokerlib.enums import Rank, Suit, Hand, RoundPublicInId, RoundPublicOutId
+
+CARDS = list(product(Rank, Suit))
+n_tests = 5000
+
+# strengths and indices are the same as those of HandParser
+for ncards in (2, 5, 6, 7, 9):
+    for _ in range(n_tests):
+        cards = sample(CARDS, ncards)
+        hand, bitmask = HandParser(cards), BitmaskHandParser(cards)
+        assert bitmask.strength == hand.strength
+        assert bitmask.handenum == hand.handenum
+        assert bitmask.handbase == hand.handbase
+        assert bitmask.kickers == hand.kickers
+
+# indices are recomputed after adding cards
+hand = BitmaskHandParser([[12, 0], [12, 1], [3, 2]])
+assert hand.handenum == Hand.ONEPAIR
+assert hand.handbase == [2, 1] and hand.kickers == [0]
+hand += [[3, 3], [3, 0]]
+assert hand.handenum == Hand.FULLHOUSE
+assert hand.handbase == [0, 1, 2, 3, 4] and hand.kickers == []
+assert list(hand.handbasecards) == [[3, 0], [3, 2], [3, 3], [12, 0], [12, 1]]
+
+# the wheel is indexed with the ace last
+hand = BitmaskHandParser([[12, 1], [0, 1], [1, 1], [2, 1], [3, 1], [8, 2]])
+assert hand.handenum == Hand.STRAIGHTFLUSH
+assert hand.handbase == [3, 2, 1, 0, 5]
+
+# shared evaluation needs no lookup tables
+board = [[8, 0], [9, 0], [10, 0], [11, 0], [0, 2]]
+holes = [[[12, 0], [1, 1]], [[0, 0], [0, 1]]]
+strengths = BitmaskHandParser.evaluateShared(board, holes)
+assert strengths[0] >> 20 == Hand.STRAIGHTFLUSH
+assert strengths[1] >> 20 == Hand.FLUSH
+
+# round can be run with the bitmask backend
+class BitmaskRound(Round):
+    HandParserClass = BitmaskHandParser
+
+players = PlayerGroup([Player(0, i, f"player{i}", 1000) for i in range(3)])
+game = BitmaskRound(0, players, 0, 5, 10)
+while not game.finished:
+    player = game.current_player
+    action = RoundPublicInId.CALL if game.to_call else RoundPublicInId.CHECK
+    game.publicIn(player.id, action)
+
+assert sum(player.money for player in players) == 3000
+for out in game.public_out_queue:
+    if out.id is RoundPublicOutId.DECLAREFINISHEDWINNER:
+        player = players.getPlayerById(out.data['player_id'])
+        assert out.data['handname'] == max(p.hand for p in players).handenum
+        assert len(out.data['hand']) == len(player.hand.handbase)
@@ -0,0 +1,79 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import sample, shuffle
+from itertools import permutations
+from pokerlib import HandParser, CachedHandParser, HandCache
+from pokerlib.cards import DECK, canonicalForm
+from pokerlib.enums import Hand
+
+# suit permuted hands share the canonical form
+hole, board = [48, 45], [2, 6, 10, 47, 33]
+forms = {
+    canonicalForm(
+        [card & ~3 | perm[card & 3] for card in hole],
+        [card & ~3 | perm[card & 3] for card in board]
+    ) for perm in permutations(range(4))
+}
+assert len(forms) == 1
+assert canonicalForm(hole, board) != canonicalForm(board[:2], hole + board[2:])
+
+# cached parses agree with HandParser
+CachedHandParser.cache = HandCache(maxsize=1000)
+for _ in range(5000):
+    cards = sample(DECK, 7)
+    shuffle(cards)
+    hand, cached = HandParser(cards), CachedHandParser(cards)
+    assert cached.strength == hand.strength
+    assert cached.handenum == hand.handenum
+    ranks = [card[0] for card in cached.handfullcards]
+    assert ranks == [card[0] for card in hand.handfullcards]
+    assert len(set(cached.handbase + cached.kickers)) == len(ranks)
+    if hand.handenum in (Hand.FLUSH, Hand.STRAIGHTFLUSH):
+        assert len({card[1] for card in cached.handbasecards}) == 1
+
+info = CachedHandParser.cache.info()
+assert info.hits + info.misses == 5000
+assert info.currsize == len(CachedHandParser.cache) <= 1000
+
+# hands are cached by sorted suit masks, which tell hands apart
+# exactly when their cards' canonical forms do
+CachedHandParser.cache = HandCache()
+forms = set()
+for _ in range(300):
+    cards = sample(range(52), 5)
+    for perm in sample(list(permutations(range(4))), 3):
+        permuted = [card & ~3 | perm[card & 3] for card in cards]
+        forms.add(canonicalForm(permuted))
+        CachedHandParser(permuted).parse()
+assert CachedHandParser.cache.misses == len(forms)
+
+# a suit permuted hand is a cache hit
+cache = CachedHandParser.cache = HandCache(maxsize=2)
+hand = CachedHandParser([(12, 0), (12, 1), (3, 2), (7, 3), (9, 0)])
+assert hand.handenum == Hand.ONEPAIR
+hand = CachedHandParser([(12, 3), (12, 2), (3, 1), (7, 0), (9, 3)])
+assert hand.handenum == Hand.ONEPAIR
+assert [card[0] for card in hand.handbasecards] == [12, 12]
+assert cache.hits == 1 and cache.misses == 1
+
+# handbase and kickers read first on a cache hit are restored
+for attribute in ('handbase', 'kickers', 'handfullcards'):
+    cards = [(12, 2), (12, 0), (3, 3), (7, 1), (9, 2)]
+    expected = getattr(HandParser(cards), attribute)
+    assert list(getattr(CachedHandParser(cards), attribute)) == list(expected)
+assert cache.hits == 4
+
+# adding cards reparses the hand
+hand += [(12, 1), (7, 2)]
+assert hand.handenum == Hand.FULLHOUSE
+assert [card[0] for card in hand.handbasecards] == [12, 12, 12, 7, 7]
+
+# least recently used entries are evicted
+CachedHandParser([(0, 0), (1, 1)]).parse()
+assert len(cache) == 2
+hand = CachedHandParser([(12, 1), (12, 2), (3, 0), (7, 3), (9, 1)])
+assert hand.handenum == Hand.ONEPAIR and cache.misses == 4
+
+cache.clear()
+assert cache.info() == (0, 0, 2, 0)
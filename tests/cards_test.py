@@ -0,0 +1,63 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import sample
+from pokerlib import HandParser, LookupHandParser, Round, Player, PlayerGroup
+from pokerlib.enums import Rank, Suit, Hand, RoundPublicInId, RoundPublicOutId
+from pokerlib.cards import (
+    DECK, CARD_TUPLES, makeCard, cardRank, cardSuit, toCompact, toTuple,
+    compactCards, tupleCards, cardMask, maskCards
+)
+
+assert len(DECK) == 52
+assert makeCard(Rank.ACE, Suit.HEART) == 51
+assert makeCard(Rank.TWO, Suit.SPADE) == 0
+for card in DECK:
+    rank, suit = CARD_TUPLES[card]
+    assert cardRank(card) is rank and cardSuit(card) is suit
+    assert toCompact((rank, suit)) == card
+    assert toCompact([rank, suit]) == card
+    assert toTuple(card) == (rank, suit)
+    assert toCompact(card) == card
+
+cards = [(Rank.KING, Suit.CLUB), 3, [Rank.TEN, Suit.DIAMOND]]
+assert compactCards(cards) == [45, 3, 34]
+assert tupleCards([45, 3]) == [(Rank.KING, Suit.CLUB), (Rank.TWO, Suit.HEART)]
+assert cardMask(cards) == 1 << 45 | 1 << 3 | 1 << 34
+assert maskCards(cardMask(cards)) == [3, 34, 45]
+assert maskCards(0) == []
+
+# parsers produce the same results for compact and tuple cards
+for _ in range(2000):
+    compact = sample(DECK, 7)
+    tupled = tupleCards(compact)
+    hand, compact_hand = HandParser(tupled), HandParser(list(compact))
+    assert hand.handenum == compact_hand.handenum
+    assert hand.handbase == compact_hand.handbase
+    assert hand.kickers == compact_hand.kickers
+    assert hand == compact_hand
+    assert LookupHandParser(compact) == LookupHandParser(tupled)
+
+hand = HandParser([51, 47])
+hand += [43, 39, 35]
+assert hand.handenum == Hand.STRAIGHTFLUSH
+assert hand.original == [51, 47, 43, 39, 35]
+
+# compact rounds deal and output compact cards
+class CompactRound(Round):
+    compact_cards = True
+
+players = PlayerGroup([Player(0, i, f"player{i}", 1000) for i in range(3)])
+game = CompactRound(0, players, 0, 5, 10)
+for player in players:
+    assert all(type(card) is int for card in player.cards)
+while not game.finished:
+    player = game.current_player
+    action = RoundPublicInId.CALL if game.to_call else RoundPublicInId.CHECK
+    game.publicIn(player.id, action)
+
+assert all(type(card) is int for card in game.board)
+assert len(set(game.board).union(*(p.cards for p in players))) == 11
+for out in game.public_out_queue:
+    if out.id is RoundPublicOutId.DECLAREFINISHEDWINNER:
+        assert all(type(card) is int for card in out.data['hand'])
@@ -0,0 +1,65 @@
+import sys
+sys.path.append('../pokerlib')
+
+import numpy as np
+from pokerlib.env import VectorEnv, FOLD, CALL, RAISE, ALLIN, NACTIONS
+
+# heads-up, the seat after the button posts the small blind and acts
+# first preflop, so folding every hand loses it the small blind
+env = VectorEnv(8, 2, stack=100, small_blind=1, big_blind=2, seed=0)
+obs = env.reset()
+assert obs.shape == (8, env.obs_size)
+assert (env.current_seats == 1).all()
+obs, rewards, dones = env.step(np.full(8, FOLD))
+assert dones.all()
+assert (rewards == [[1, -1]] * 8).all()
+# the new rounds have the button moved
+assert (env.current_seats == 0).all()
+
+# going all-in and calling ends the round with the whole stacks at stake
+obs, rewards, dones = env.step(np.full(8, ALLIN))
+assert not dones.any() and not rewards.any()
+obs, rewards, dones = env.step(np.full(8, CALL))
+assert dones.all()
+assert set(np.abs(rewards).ravel()) <= {0, 100}
+assert (rewards.sum(axis=1) == 0).all()
+
+# observations describe each round from the player to act
+rng = np.random.default_rng(1)
+env = VectorEnv(16, 4, stack=200, seed=1)
+encoder = env.encoder
+obs = env.reset()
+nfinished = 0
+for _ in range(500):
+    for i, round in enumerate(env.rounds):
+        seat = env.current_seats[i]
+        player = round.players[seat]
+        assert round.current_player is player
+        hole = np.flatnonzero(obs[i, encoder.hole:encoder.board])
+        assert sorted(hole) == sorted(player.cards)
+        assert obs[i, encoder.stacks] * round.big_blind == player.money
+        assert obs[i, encoder.to_call] * round.big_blind == round.to_call
+        assert obs[i, encoder.legal:].sum() >= 3
+    obs, rewards, dones = env.step(
+        rng.integers(0, NACTIONS, 16), rng.integers(1, 50, 16))
+    assert (rewards.sum(axis=1) == 0).all()
+    assert not rewards[~dones].any()
+    nfinished += dones.sum()
+assert nfinished > 100
+
+# environments with the same seed play the same
+def play(seed):
+    env = VectorEnv(4, 3, seed=seed)
+    env.reset()
+    results = []
+    for _ in range(200):
+        obs, rewards, dones = env.step(np.full(4, RAISE), np.full(4, 30))
+        results.append(rewards.copy())
+    return np.array(results)
+
+assert (play(5) == play(5)).all()
+
+try:
+    env.step([CALL])
+    assert False
+except ValueError: pass
@@ -0,0 +1,67 @@
+import sys
+sys.path.append('../pokerlib')
+
+from itertools import combinations
+from pokerlib import HandParser, equity
+from pokerlib.cards import DECK, tupleCards
+from pokerlib.enums import Rank, Suit
+
+def bruteForceEquity(holes, board):
+    used = [card for hole in holes for card in hole] + board
+    deck = [card for card in DECK if card not in used]
+    wins, ties, nboards = [0] * len(holes), [0] * len(holes), 0
+    for completion in combinations(deck, 5 - len(board)):
+        hands = [
+            HandParser(tupleCards(hole + board + list(completion)))
+            for hole in holes
+        ]
+        best = max(hands)
+        winners = [i for i, hand in enumerate(hands) if hand == best]
+        for i in winners:
+            if len(winners) == 1: wins[i] += 1
+            else: ties[i] += 1
+        nboards += 1
+    return [w / nboards for w in wins], [t / nboards for t in ties]
+
+holes = [[51, 47], [46, 45], [20, 25]]
+for board in ([3, 23, 44], [3, 23, 44, 8], [3, 23, 44, 8, 30], [0, 4, 8]):
+    results = equity(holes, board)
+    wins, ties = bruteForceEquity(holes, board)
+    for result, win, tie in zip(results, wins, ties):
+        assert abs(result.win - win) < 1e-12
+        assert abs(result.tie - tie) < 1e-12
+        assert abs(result.win + result.tie + result.loss - 1) < 1e-12
+    assert abs(sum(result.equity for result in results) - 1) < 1e-12
+
+# tuple cards are accepted, chopped boards split the pot
+results = equity([
+    [(Rank.TWO, Suit.HEART), (Rank.THREE, Suit.HEART)],
+    [(Rank.TWO, Suit.SPADE), (Rank.THREE, Suit.SPADE)]
+], board=[
+    (Rank.ACE, Suit.CLUB),
+    (Rank.KING, Suit.CLUB),
+    (Rank.QUEEN, Suit.DIAMOND),
+    (Rank.JACK, Suit.DIAMOND),
+    (Rank.TEN, Suit.CLUB)
+])
+assert results[0] == results[1] == (0, 1, 0, 0.5)
+
+# sampling is used when enumeration is too large, seeds are reproducible
+first = equity(holes, samples=2000, seed=5)
+second = equity(holes, samples=2000, seed=5)
+assert first == second
+assert abs(sum(result.equity for result in first) - 1) < 1e-9
+
+# dead cards are removed from the deck
+results = equity([[51, 50], [47, 46]], board=[0, 5, 26, 37], dead=[44])
+assert results[1].win == 1 / 43 # only the king of clubs wins
+
+try: equity([[51, 47], [51, 45]])
+except ValueError: pass
+else: assert False
+
+# sampled results do not depend on the number of workers
+single = equity(holes, samples=25000, seed=7, workers=1)
+multi = equity(holes, samples=25000, seed=7, workers=3)
+assert single == multi
+assert single != equity(holes, samples=25000, seed=8, workers=1)
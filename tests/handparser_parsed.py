@@ -78,3 +78,11 @@ handgroup = HandParserGroup([h1,h2,h3])
 for i in range(3): handgroup[i].parse()
 kickers = handgroup.getGroupKicker()
 assert kickers == 9
+
+# hands are ordered and hashed by their strength key
+hands = [hand1, hand2, hand3, hand9]
+assert sorted(hands, key=lambda h: h.strength) == sorted(hands)
+assert hand9.strength >> 20 == Hand.STRAIGHTFLUSH
+twin = HandParser([[3,3], [4,2], [6,1], [8,0], [10,1], [11,0], [12,3]])
+assert twin == hand1 and hash(twin) == hash(hand1)
+assert len({twin, hand1, hand2}) == 2
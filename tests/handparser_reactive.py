@@ -84,3 +84,19 @@ assert hand10.handbase == [4,3,2,1]
 cards11 = [[3,1], [6,2], [6,3], [6,1], [6,0], [12,0], [12,1]]
 hand11 = HandParser(cards11)
 assert list(hand11.handbasecards) == [[6, 0], [6, 1], [6, 3], [6, 2]]
+
+# street-by-street parsing gives the same result as parsing the full hand
+from random import sample
+from itertools import product
+for _ in range(5000):
+    cards = sample(list(product(Rank, Suit)), 7)
+    hand = HandParser(cards[:2])
+    hand.parse()
+    for new_cards in (cards[2:5], cards[5:6], cards[6:7]):
+        hand += new_cards
+        hand.parse()
+    full = HandParser(list(cards))
+    assert hand.handenum == full.handenum
+    assert hand == full
+    assert [rank for rank, _ in hand.handfullcards] == \
+        [rank for rank, _ in full.handfullcards]
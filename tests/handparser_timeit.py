@@ -4,7 +4,7 @@ sys.path.append('../pokerlib')
 from timeit import timeit
 from itertools import product
 from random import sample
-from pokerlib import HandParser
+from pokerlib import HandParser, LookupHandParser
 from pokerlib.enums import Rank, Suit
 
 def randomHand():
@@ -13,7 +13,13 @@ def randomHand():
 def randomParse():
     HandParser(randomHand()).parse()
 
+def randomLookupParse():
+    LookupHandParser(randomHand()).parse()
+
 n = 10**6
+LookupHandParser(randomHand()).parse() # build lookup tables
 thand = timeit(randomHand, number=n)
 tparse = timeit(randomParse , number=n)
-print(f'HandParser parse time: {tparse - thand}')
\ No newline at end of file
+tlookup = timeit(randomLookupParse, number=n)
+print(f'HandParser parse time: {tparse - thand}')
+print(f'LookupHandParser parse time: {tlookup - thand}')
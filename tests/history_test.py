@@ -0,0 +1,141 @@
+import sys
+sys.path.append('../pokerlib')
+
+import os, io, copy, tempfile
+from random import seed, randint, choice
+from pokerlib import Player, PlayerGroup
+from pokerlib.enums import RoundPublicInId, RoundPrivateOutId
+from pokerlib.history import (
+    HistoryRound, HistoryWriter, RoundHeader, readHistory
+)
+
+# outs are decoded as they were when the round emitted them
+def recordRounds(writer, compact, nrounds):
+    outs = []
+    class RecordedRound(HistoryRound):
+        history = writer
+        compact_cards = compact
+        def publicOut(self, out_id, **kwargs):
+            super().publicOut(out_id, **kwargs)
+            outs.append(copy.deepcopy(self.public_out_queue.pop()))
+        def privateOut(self, player_id, out_id, **kwargs):
+            super().privateOut(player_id, out_id, **kwargs)
+            outs.append(copy.deepcopy(self.private_out_queue.pop()))
+
+    seed(1)
+    for round_id in range(nrounds):
+        n = randint(2, 9)
+        players = PlayerGroup([
+            Player(0, i, f"player{i}", randint(1, 400)) for i in range(n)])
+        try:
+            game = RecordedRound(round_id, players, randint(0, n - 1), 2, 4)
+            while not game.finished:
+                game.publicIn(
+                    game.current_player.id,
+                    choice(list(RoundPublicInId)[:5]),
+                    raise_by = randint(1, 60)
+                )
+            for player_id in list(game._muck_optioned_player_ids):
+                game.publicIn(player_id, choice(
+                    [RoundPublicInId.SHOW, RoundPublicInId.MUCK]))
+        except TypeError: pass # current player can be missing mid-round
+    writer.flush()
+    return outs
+
+def tupled(value):
+    # rounds deal (rank, suit) cards as lists
+    if isinstance(value, (list, tuple)) and value and \
+            isinstance(value[0], list):
+        return type(value)(tuple(card) for card in value)
+    return value
+
+for compact in (True, False):
+    file = io.BytesIO()
+    outs = recordRounds(HistoryWriter(file), compact, 100)
+    outs = [
+        type(out)(*out[:-1], {k: tupled(v) for k, v in out[-1].items()})
+        for out in outs
+    ]
+    records = list(readHistory(file.getvalue()))
+    headers = [r for r in records if isinstance(r, RoundHeader)]
+    assert [r for r in records if not isinstance(r, RoundHeader)] == outs
+    assert [header.round_id for header in headers] == list(range(100))
+    assert all(header.compact_cards is compact for header in headers)
+
+# files are read through a memory map
+path = os.path.join(tempfile.mkdtemp(), 'history.bin')
+with open(path, 'wb') as file, HistoryWriter(file) as writer:
+    outs = recordRounds(writer, True, 10)
+records = list(readHistory(path))
+headers = [r for r in records if isinstance(r, RoundHeader)]
+assert len(headers) == 10 and len(records) == len(outs) + 10
+assert headers[0].small_blind == 2 and headers[0].big_blind == 4
+os.remove(path)
+
+try: list(readHistory(b'PKHX\x01'))
+except ValueError: pass
+else: assert False
+
+# ids that can't be written as varints raise, and leave no partial record
+file = io.BytesIO()
+writer = HistoryWriter(file)
+for player_id in ("player1", -1, 1.5):
+    players = PlayerGroup([
+        Player(0, player_id, "player1", 100), Player(0, 2, "player2", 100)])
+    class BadIdRound(HistoryRound):
+        history = writer
+    try:
+        BadIdRound(0, players, 0, 2, 4)
+        assert False
+    except ValueError: pass
+writer.flush()
+assert list(readHistory(file.getvalue())) == []
+try:
+    writer.writePrivateOut(-1, RoundPrivateOutId.DEALTCARDS, {'cards': []})
+    assert False
+except ValueError: pass
+
+# cards dealt as [rank, suit] lists are read back as tuples
+class ListRound(HistoryRound):
+    history = writer
+    compact_cards = False
+players = PlayerGroup([Player(0, i, f"player{i}", 100) for i in range(2)])
+game = ListRound(1, players, 0, 2, 4)
+writer.flush()
+dealt = [
+    r for r in readHistory(file.getvalue())
+    if getattr(r, 'id', None) is RoundPrivateOutId.DEALTCARDS
+]
+assert len(dealt) == 2
+for out in dealt:
+    assert all(type(card) is tuple for card in out.data['cards'])
+    assert tuple(map(list, out.data['cards'])) == \
+        players[out.player_id].cards
+
+# files without a file descriptor are read whole, and empty
+# files are rejected as not being in the history format
+file = io.BytesIO()
+outs = recordRounds(HistoryWriter(file), True, 3)
+file.seek(0)
+assert len(list(readHistory(file))) == len(outs) + 3
+path = os.path.join(tempfile.mkdtemp(), 'empty.bin')
+open(path, 'wb').close()
+for source in (path, io.BytesIO()):
+    try:
+        list(readHistory(source))
+        assert False
+    except ValueError: pass
+os.remove(path)
+
+# without a writer, masked outs are not extended
+class SilentRound(HistoryRound):
+    public_out_mask = private_out_mask = 0
+    def extendedPublicOut(self, out_id, kwargs):
+        assert False
+    def extendedPrivateOut(self, player_id, out_id, kwargs):
+        assert False
+players = PlayerGroup([Player(0, i, f"player{i}", 100) for i in range(2)])
+game = SilentRound(0, players, 0, 2, 4)
+while not game.finished:
+    game.publicIn(game.current_player.id, RoundPublicInId.ALLIN)
+assert not game.public_out_queue and not game.private_out_queue
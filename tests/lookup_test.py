@@ -0,0 +1,110 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import sample, seed
+from itertools import product
+from pokerlib import (
+    HandParser, HandParserGroup, LookupHandParser, Round, Player, PlayerGroup
+)
+from pokerlib.enums import Rank, Suit, Hand, RoundPublicInId, RoundPublicOutId
+from pokerlib._lookup import evaluate, evaluateShared, strengthHand
+from pokerlib._handparser import strengthsKicker
+from pokerlib.cards import DECK
+
+CARDS = list(product(Rank, Suit))
+n_tests = 10000
+
+for ncards in (5, 6, 7):
+    for _ in range(n_tests):
+        cards_1 = sample(CARDS, ncards)
+        cards_2 = sample(CARDS, ncards)
+        hand_1, hand_2 = HandParser(cards_1), HandParser(cards_2)
+        lookup_1, lookup_2 = LookupHandParser(cards_1), LookupHandParser(cards_2)
+        assert lookup_1.handenum == hand_1.handenum
+        assert strengthHand(evaluate(cards_1)) == hand_1.handenum
+        assert (lookup_1 > lookup_2) is (hand_1 > hand_2)
+        assert (lookup_1 < lookup_2) is (hand_1 < hand_2)
+        assert (lookup_1 == lookup_2) is (hand_1 == hand_2)
+        assert lookup_1.strength == hand_1.strength
+
+# players sharing a board are evaluated at once
+for nboard in (3, 4, 5):
+    for _ in range(n_tests // 10):
+        cards = sample(CARDS, nboard + 12)
+        board = cards[:nboard]
+        holes = [cards[i:i+2] for i in range(nboard, len(cards), 2)]
+        strengths = evaluateShared(board, holes)
+        assert strengths == [HandParser(hole + board).strength for hole in holes]
+assert evaluateShared([48, 44, 40], [[36, 32], [0, 1]])[0] >> 20 == Hand.STRAIGHTFLUSH
+
+# indices are the same as those produced by HandParser
+cards = [[3,1], [6,2], [6,3], [6,1], [6,0], [12,0], [12,1]]
+hand = LookupHandParser(cards)
+assert hand.handenum == Hand.FOUROFAKIND
+assert hand.handbase == [4,3,2,1]
+assert hand.kickers == [6]
+assert list(hand.handbasecards) == [[6, 0], [6, 1], [6, 3], [6, 2]]
+
+# adding cards invalidates the strength
+hand = LookupHandParser([(Rank.KING, Suit.SPADE), (Rank.ACE, Suit.SPADE)])
+assert hand.handenum == Hand.HIGHCARD
+hand += [
+    (Rank.TEN, Suit.SPADE),
+    (Rank.JACK, Suit.SPADE),
+    (Rank.QUEEN, Suit.SPADE)
+]
+assert hand.handenum == Hand.STRAIGHTFLUSH
+assert hand.ncards == 5
+
+# round can be run with the lookup backend
+class LookupRound(Round):
+    HandParserClass = LookupHandParser
+
+players = PlayerGroup([Player(0, i, f"player{i}", 1000) for i in range(3)])
+game = LookupRound(0, players, 0, 5, 10)
+while not game.finished:
+    player = game.current_player
+    action = RoundPublicInId.CALL if game.to_call else RoundPublicInId.CHECK
+    game.publicIn(player.id, action)
+
+assert sum(player.money for player in players) == 3000
+winner_outs = [
+    out for out in game.public_out_queue
+    if out.id is RoundPublicOutId.DECLAREFINISHEDWINNER
+]
+assert len(winner_outs) > 0
+for out in winner_outs:
+    player = players.getPlayerById(out.data['player_id'])
+    assert isinstance(player.hand, LookupHandParser)
+    assert out.data['handname'] == max(p.hand for p in players).handenum
+
+# group kickers read from strengths are the same as from parsed hands
+seed(11)
+for _ in range(3000):
+    cards = sample(DECK, 5 + 2 * 4)
+    board, holes = cards[:5], [cards[5+2*i:7+2*i] for i in range(4)]
+    strengths = evaluateShared(board, holes)
+    hands = HandParserGroup([HandParser(board + hole) for hole in holes])
+    assert strengthsKicker(strengths) == hands.getGroupKicker()
+
+# a lazy silent all-in showdown parses no hands
+parses = 0
+parse = HandParser.parse
+def countedParse(self):
+    global parses
+    parses += 1
+    parse(self)
+HandParser.parse = countedParse
+
+class SilentLookupRound(LookupRound):
+    lazy_hands = True
+    public_out_mask = 0
+    private_out_mask = 0
+
+players = PlayerGroup([Player(0, i, f"player{i}", 1000) for i in range(6)])
+game = SilentLookupRound(0, players, 0, 5, 10)
+while not game.finished:
+    game.publicIn(game.current_player.id, RoundPublicInId.ALLIN)
+assert sum(player.money for player in players) == 6000
+assert parses == 0
+HandParser.parse = parse
@@ -0,0 +1,78 @@
+import sys
+sys.path.append('../pokerlib')
+
+import numpy as np
+from array import array
+from pokerlib import Player, PlayerGroup, Round
+from pokerlib.enums import Turn, RoundPublicInId
+from pokerlib.cards import toCompact
+from pokerlib.observation import ObservationEncoder
+
+class SilentRound(Round):
+    public_out_mask = 0
+    private_out_mask = 0
+
+players = PlayerGroup([Player(0, i, f"player{i}", 200) for i in range(3)])
+game = SilentRound(0, players, 0, 5, 10)
+encoder = ObservationEncoder(4)
+assert encoder.size == 52 + 52 + 4 + 4 + 16 + 4 + 4 + 4 + 1 + 1 + 5
+
+# preflop, player0 is on the button and first to act after the blinds
+out = np.full(encoder.size, 7, dtype=np.float32)
+encoder.encode(game, out)
+assert game.current_player.id == 0
+hole = np.flatnonzero(out[encoder.hole:encoder.board])
+assert sorted(hole) == sorted(toCompact(card) for card in players[0].cards)
+assert not out[encoder.board:encoder.street].any()
+assert list(out[encoder.street:encoder.stacks]) == [1, 0, 0, 0]
+assert list(out[encoder.stacks:encoder.stakes]) == [20, 19.5, 19, 0]
+assert list(out[encoder.stakes:encoder.button]) == [
+    0, 0, 0, 0, 0.5, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+assert list(out[encoder.button:encoder.folded]) == [1, 0, 0, 0]
+assert out[encoder.pot] == 1.5 and out[encoder.to_call] == 1
+assert list(out[encoder.legal:]) == [1, 0, 1, 1, 1]
+
+# a player that is not to act has no legal actions
+encoder.encode(game, out, player_id=1)
+# seats are listed from player1's, so the button is the last one
+assert list(out[encoder.stacks:encoder.stakes]) == [19.5, 19, 20, 0]
+assert list(out[encoder.button:encoder.folded]) == [0, 0, 1, 0]
+assert out[encoder.to_call] == 0.5
+assert not out[encoder.legal:].any()
+
+# after the flop, with player0 folded
+game.publicIn(0, RoundPublicInId.FOLD)
+game.publicIn(1, RoundPublicInId.CALL)
+game.publicIn(2, RoundPublicInId.CHECK)
+assert game.turn == Turn.FLOP
+encoder.encode(game, out)
+assert game.current_player.id == 1
+board = np.flatnonzero(out[encoder.board:encoder.street])
+assert sorted(board) == sorted(toCompact(card) for card in game.board)
+assert list(out[encoder.street:encoder.stacks]) == [0, 1, 0, 0]
+assert list(out[encoder.folded:encoder.all_in]) == [0, 0, 1, 0]
+assert out[encoder.pot] == 2 and out[encoder.to_call] == 0
+assert list(out[encoder.legal:]) == [1, 1, 0, 1, 1]
+
+# batches of rounds are encoded into rows, the same as one by one,
+# and any float32 buffer can be written into
+rounds = [game, SilentRound(1, PlayerGroup([
+    Player(0, i, f"player{i}", 100) for i in range(4)]), 1, 5, 10)]
+batch = np.zeros((2, encoder.size), dtype=np.float32)
+encoder.encodeBatch(rounds, batch)
+for round, row in zip(rounds, batch):
+    buffer = array('f', bytes(4 * encoder.size))
+    encoder.encode(round, buffer)
+    assert list(buffer) == list(row)
+
+for bad in [np.zeros(encoder.size - 1, dtype=np.float32),
+            np.zeros(encoder.size, dtype=np.float64)]:
+    try:
+        encoder.encode(game, bad)
+        assert False
+    except ValueError: pass
+
+try:
+    ObservationEncoder(2).encode(game, np.zeros(200, dtype=np.float32))
+    assert False
+except ValueError: pass
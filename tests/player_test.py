@@ -0,0 +1,60 @@
+import sys
+sys.path.append('../pokerlib')
+from random import seed, randint, random
+from pokerlib import Player, PlayerGroup, PlayerSeats
+
+# seat rings move to the same players as a scan over the seats
+def scan(players, i, is_member, backwards=False):
+    n = len(players)
+    seats = range(i + 1, i + n)
+    if backwards: seats = reversed(seats)
+    for k in seats:
+        if is_member(players[k % n]): return k % n
+
+seed(7)
+for _ in range(300):
+    n = randint(1, 12)
+    players = PlayerGroup([Player(0, i, f"player{i}", 100) for i in range(n)])
+    for _ in range(2 * n):
+        player = players[randint(0, n - 1)]
+        if random() < 0.5: player.is_folded = True
+        else: player.is_all_in = True
+        if random() < 0.5: players.unlinkPlayer(player)
+        for i in range(-1, n + 1):
+            assert players.nextActiveIndex(i) == \
+                scan(players, i, lambda p: p.is_active)
+            assert players.previousActiveIndex(i) == \
+                scan(players, i, lambda p: p.is_active, True)
+            assert players.nextUnfoldedIndex(i) == \
+                scan(players, i, lambda p: not p.is_folded)
+            assert players.previousUnfoldedIndex(i) == \
+                scan(players, i, lambda p: not p.is_folded, True)
+
+# players come back to the rings once they are reset
+for player in players: player.resetState()
+players.resetSeatRings()
+assert players.nextActiveIndex(0) == (1 if n > 1 else None)
+
+# lookups by id follow changes to the group
+players = PlayerGroup([Player(0, i, f"player{i}", 100) for i in range(4)])
+assert players.getPlayerById(2) is players[2]
+players.pop(0)
+assert players.getPlayerById(2) is players[1]
+assert players.getPlayerById(0) is None
+
+# seats are looked up by id and filled from the lowest free seat
+seats = PlayerSeats([None] * 6)
+player1 = Player(0, 1, "player1", 100)
+player2 = Player(0, 2, "player2", 100)
+player3 = Player(0, 3, "player3", 100)
+assert seats.seatPlayerAt(player1, 0)
+assert seats.append(player2) == 1
+assert player2 in seats and seats.getPlayerById(2) is player2
+seats.remove(player1)
+assert player1 not in seats and seats.getPlayerById(1) is None
+assert seats.seatPlayerAt(player1, 2)
+assert seats.append(player3) == 0
+assert seats.append(Player(0, 4, "player4", 100)) == 3
+assert seats.nFilled() == 4
+seats[3] = None
+assert seats.append(Player(0, 5, "player5", 100)) == 3
@@ -0,0 +1,58 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import seed, randint, choice
+from pokerlib import Player, PlayerGroup, Round
+from pokerlib.enums import RoundPublicInId, RoundPublicOutId
+from pokerlib._pots import Pot, buildPots, splitPot
+
+def stakedPlayers(stakes, folded=()):
+    players = PlayerGroup()
+    for i, stake in enumerate(stakes):
+        player = Player(0, i, f"player{i}", 0)
+        player.stake = stake
+        player.is_folded = i in folded
+        players.append(player)
+    return players
+
+# a pot for each distinct unfolded stake
+pots = buildPots(stakedPlayers([50, 100, 100, 200, 30], folded=[4]))
+assert pots == [
+    Pot(4 * 50 + 30, 50, (0, 1, 2, 3)),
+    Pot(3 * 50, 100, (1, 2, 3)),
+    Pot(100, 200, (3,))
+]
+assert sum(pot.amount for pot in pots) == 480
+
+# folded chips above the largest unfolded stake go to the last pot
+pots = buildPots(stakedPlayers([40, 40, 100], folded=[2]))
+assert pots == [Pot(180, 40, (0, 1))]
+
+# odd chips are given in order
+assert splitPot(100, [1, 2, 3]) == [34, 33, 33]
+assert splitPot(5, [1, 2]) == [3, 2]
+
+# chips are conserved in multiway all ins
+seed(0)
+for _ in range(200):
+    nplayers = randint(2, 10)
+    players = PlayerGroup([
+        Player(0, i, f"player{i}", randint(1, 300)) for i in range(nplayers)
+    ])
+    total = sum(player.money for player in players)
+    game = Round(0, players, randint(0, nplayers - 1), 1, 2)
+    while not game.finished:
+        player = game.current_player
+        action = choice([
+            RoundPublicInId.ALLIN, RoundPublicInId.CALL, RoundPublicInId.FOLD])
+        if action is RoundPublicInId.CALL and not game.to_call:
+            action = RoundPublicInId.CHECK
+        game.publicIn(player.id, action)
+    assert sum(player.money for player in players) == total
+    assert all(type(player.money) is int for player in players)
+
+    for out in game.public_out_queue:
+        if out.id is RoundPublicOutId.DECLAREFINISHEDWINNER:
+            pot = out.data['pot']
+            assert out.data['player_id'] in pot.player_ids
+            assert out.data['money_won'] <= pot.amount
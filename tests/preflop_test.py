@@ -0,0 +1,73 @@
+import sys
+sys.path.append('../pokerlib')
+
+import os
+from tempfile import mkstemp
+from itertools import permutations
+from pokerlib import PreflopMatrix, equity
+from pokerlib._preflop import (
+    NCOMBOS, comboIndex, indexCombo, writePreflopMatrix, _matchupKey,
+    matchupClasses, generatePreflopMatrix
+)
+
+# combos are indexed by their cards, regardless of order
+assert [indexCombo(i) for i in range(NCOMBOS)] == [
+    (high, low) for high in range(52) for low in range(high)]
+assert comboIndex(51, 50) == comboIndex(50, 51) == NCOMBOS - 1
+
+# matchups differing by a suit permutation share their key
+combo1, combo2 = (48, 45), (46, 30)
+keys = {
+    _matchupKey(*[[card & ~3 | perm[card & 3] for card in combo]
+                  for combo in (combo1, combo2)])
+    for perm in permutations(range(4))
+}
+assert len(keys) == 1
+assert _matchupKey(combo1, combo2) != _matchupKey(combo2, combo1)
+
+# equities are read from the memory mapped file
+equities = [
+    [(i - j) % 101 / 100 for j in range(NCOMBOS)] for i in range(NCOMBOS)]
+fd, path = mkstemp()
+os.close(fd)
+writePreflopMatrix(path, equities)
+with PreflopMatrix(path) as matrix:
+    i, j = comboIndex(51, 50), comboIndex(47, 3)
+    assert abs(matrix.equity([50, 51], [3, 47]) - equities[i][j]) < 1e-4
+    assert abs(matrix.equity([(12, 2), (12, 3)], [(11, 3), (0, 3)])
+               - equities[i][j]) < 1e-4
+    try: matrix.equity([50, 51], [51, 47])
+    except ValueError: pass
+    else: assert False
+
+with open(path, 'r+b') as file:
+    file.write(b'XXXX')
+try: PreflopMatrix(path)
+except ValueError: pass
+else: assert False
+os.remove(path)
+
+# a generated class holds the equity of each of its matchups, the whole
+# matrix takes about 50 CPU hours, so only one class is generated
+classes = matchupClasses()
+assert len(classes) == 47008
+assert sum(map(len, classes.values())) == NCOMBOS * 1225 // 2
+pair = (comboIndex(48, 45), comboIndex(46, 30))
+matchup = next(
+    m for m, pairs in classes.items()
+    if pair in pairs or pair[::-1] in pairs
+)
+pairs = classes[matchup]
+assert len(pairs) > 1
+fd, path = mkstemp()
+os.close(fd)
+generatePreflopMatrix(path, classes={matchup: pairs})
+i, j = pairs[-1]
+expected = equity([list(indexCombo(i)), list(indexCombo(j))],
+                  max_evaluations=1 << 32)[0].equity
+with PreflopMatrix(path) as matrix:
+    for i, j in pairs:
+        assert abs(matrix.indexEquity(i, j) - expected) < 1e-4
+        assert abs(matrix.indexEquity(j, i) - (1 - expected)) < 1e-4
+    assert matrix.indexEquity(comboIndex(51, 50), comboIndex(3, 2)) == 0
+os.remove(path)
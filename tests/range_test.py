@@ -0,0 +1,60 @@
+import sys
+sys.path.append('../pokerlib')
+
+from pokerlib import equity, parseRange, rangeEquity
+from pokerlib.cards import makeCard
+from pokerlib.enums import Rank, Suit
+
+def card(text):
+    return makeCard('23456789TJQKA'.index(text[0]), 'scdh'.index(text[1]))
+
+assert len(parseRange('AA')) == 6
+assert len(parseRange('AKs')) == 4
+assert len(parseRange('AKo')) == 12
+assert len(parseRange('AK')) == 16
+assert len(parseRange('QQ+')) == 18
+assert len(parseRange('QQ-99')) == 24
+assert len(parseRange('A9s+')) == 20
+assert len(parseRange('AKs, QQ+, 76s-54s')) == 34
+assert set(parseRange('76s-54s')) == set(parseRange('76s, 65s, 54s'))
+assert set(parseRange('A5o-A2o')) == set(parseRange('A5o, A4o, A3o, A2o'))
+assert parseRange('AhKd') == {(card('Ah'), card('Kd')): 1}
+assert parseRange('KdAh') == parseRange('AhKd')
+
+weighted = parseRange('KK+, AKs:0.5, AhKh:0.25')
+assert weighted[(card('Ah'), card('Kh'))] == 0.25
+assert weighted[(card('As'), card('Ks'))] == 0.5
+assert weighted[(card('Ad'), card('As'))] == 1
+
+for invalid in ('AKx', 'AAs', 'A1', 'AKs-QJo', 'AKs-T8s', 'AhAh'):
+    try: parseRange(invalid)
+    except ValueError: pass
+    else: assert False, invalid
+
+# weighted range equity agrees with evaluating every matchup separately
+range1 = parseRange('AA, KQs:0.5')
+range2 = parseRange('KK, QJs, 77:0.3')
+board = [card('2h'), card('Ks'), card('9c'), card('Jh')]
+blocked = set(board)
+sums, total = [0, 0], 0
+for combo1, weight1 in range1.items():
+    for combo2, weight2 in range2.items():
+        used = set(combo1) | set(combo2)
+        if len(used) < 4 or used & blocked: continue
+        result1, result2 = equity([list(combo1), list(combo2)], board)
+        total += weight1 * weight2
+        sums[0] += weight1 * weight2 * result1.equity
+        sums[1] += weight1 * weight2 * result2.equity
+
+result1, result2 = rangeEquity(range1, range2, board)
+assert abs(result1.equity - sums[0] / total) < 1e-9
+assert abs(result2.equity - sums[1] / total) < 1e-9
+assert abs(result1.win - result2.loss) < 1e-9
+assert abs(result1.equity + result2.equity - 1) < 1e-9
+
+# range strings are accepted, dead cards block combos
+dead = [card('Ac')]
+result1, result2 = rangeEquity('AA', 'KK', board, dead)
+expected1, expected2 = rangeEquity('AsAh, AsAd, AhAd', 'KK', board, dead)
+assert abs(result1.equity - expected1.equity) < 1e-9
+assert abs(result2.win - expected2.win) < 1e-9
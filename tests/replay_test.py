@@ -0,0 +1,73 @@
+import sys
+sys.path.append('../pokerlib')
+
+import io
+from random import seed, randint, choice
+from pokerlib import Player, PlayerGroup
+from pokerlib.enums import RoundPublicInId
+from pokerlib.history import HistoryRound, HistoryWriter, readHistory
+from pokerlib.replay import Replay, roundLogs
+
+def roundState(round):
+    return (
+        round.turn, round.pot_size, list(round.board),
+        [(p.money, p.is_folded, p.is_all_in) for p in round.players],
+        round.finished, round.closed,
+        None if round.finished else round.current_player.id
+    )
+
+# a session of rounds, where players keep their money between rounds
+file = io.BytesIO()
+writer = HistoryWriter(file)
+
+class RecordedRound(HistoryRound):
+    history = writer
+    compact_cards = True
+
+seed(4)
+players = PlayerGroup([Player(0, i, f"player{i}", 200) for i in range(5)])
+states = []
+for round_id in range(40):
+    players = PlayerGroup([p for p in players if p.money > 0])
+    if len(players) < 2: break
+    for player in players: player.resetState()
+    game = RecordedRound(round_id, players, round_id % len(players), 2, 4)
+    while not game.closed:
+        if game.finished:
+            player_id = game._muck_optioned_player_ids[0]
+            action = choice([RoundPublicInId.SHOW, RoundPublicInId.MUCK])
+        else:
+            player_id = game.current_player.id
+            action = choice([
+                RoundPublicInId.FOLD, RoundPublicInId.CALL,
+                RoundPublicInId.RAISE, RoundPublicInId.CALL
+            ] if game.to_call else [
+                RoundPublicInId.CHECK, RoundPublicInId.RAISE
+            ])
+        nouts = len(game.public_out_queue)
+        game.publicIn(player_id, action, raise_by=randint(1, 20))
+        # rejected actions leave no outs and are not logged
+        if len(game.public_out_queue) > nouts:
+            states.append(roundState(game))
+writer.flush()
+
+# every action of the session is replayed to the same state
+logs = list(roundLogs(readHistory(file.getvalue())))
+replay = Replay(logs)
+assert len(replay) == len(states)
+for k in range(len(replay)):
+    assert roundState(replay.seek(k + 1)) == states[k]
+
+# stacks that are not logged follow from the earlier rounds
+logs = [logs[0]] + [
+    log._replace(players=tuple((_id, None) for _id, _ in log.players))
+    for log in logs[1:]
+]
+replay = Replay(logs, snapshot_interval=4)
+for k in reversed(range(0, len(replay), 7)):
+    assert roundState(replay.seek(k + 1)) == states[k]
+assert replay._snapshots and all(i % 4 == 0 for i in replay._snapshots)
+
+try: replay.seek(len(replay) + 1)
+except ValueError: pass
+else: assert False
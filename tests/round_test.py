@@ -170,4 +170,118 @@ assert kwargs['player_id'] == player2.id
 assert kwargs['all_in_stake'] == 940
 _id, kwargs = called
 assert _id is table.round.PublicOutId.PLAYERCALL
-assert kwargs['paid_amount'] == 940
\ No newline at end of file
+assert kwargs['paid_amount'] == 940
+
+# lazy hands - evaluated only at showdown, with the same outcome
+from random import seed
+from pokerlib import Round, PlayerGroup
+from pokerlib.enums import RoundPublicInId
+
+class LazyRound(Round):
+    lazy_hands = True
+
+def playRound(RoundClass, random_seed):
+    seed(random_seed)
+    players = PlayerGroup([Player(0, i, f"player{i}", 1000) for i in range(4)])
+    game = RoundClass(0, players, 0, 5, 10)
+    while not game.finished:
+        player = game.current_player
+        if game.turn is Turn.FLOP and player.id == 3:
+            assert game.getPlayerHand(player.id).ncards == 5
+            game.publicIn(player.id, RoundPublicInId.FOLD)
+        elif game.to_call:
+            game.publicIn(player.id, RoundPublicInId.CALL)
+        else: game.publicIn(player.id, RoundPublicInId.CHECK)
+    return players, game
+
+for random_seed in range(20):
+    players, game = playRound(Round, random_seed)
+    lazy_players, lazy_game = playRound(LazyRound, random_seed)
+    assert [p.money for p in players] == [p.money for p in lazy_players]
+    assert list(game.public_out_queue) == list(lazy_game.public_out_queue)
+    assert lazy_players[3].hand.ncards == 5
+    assert all(p.hand.ncards == 7 for p in lazy_players[:3])
+
+# running pot totals agree with the totals summed over players
+from random import randint, choice
+
+class CheckedRound(Round):
+    def _potsBalanced(self):
+        stakes = [p.turn_stake[self.turn] for p in self.players]
+        assert self.turn_stake == max(stakes)
+        assert self.pot_size == [
+            sum(p.turn_stake[i] for p in self.players) for i in range(4)]
+        active = {p.turn_stake[self.turn] for p in self.players if p.is_active}
+        all_in = max([
+            p.turn_stake[self.turn] for p in self.players if p.is_all_in
+        ] or [0])
+        balanced = not active or len(active) == 1 and min(active) >= all_in
+        assert super()._potsBalanced() == balanced
+        return balanced
+
+seed(3)
+for _ in range(300):
+    n = randint(2, 9)
+    players = PlayerGroup([
+        Player(0, i, f"player{i}", randint(1, 400)) for i in range(n)])
+    game = CheckedRound(0, players, randint(0, n - 1), 2, 4)
+    try:
+        while not game.finished:
+            game.publicIn(
+                game.current_player.id,
+                choice(list(RoundPublicInId)[:5]),
+                raise_by = randint(1, 60)
+            )
+    except TypeError:
+        # the only known failure: no active player is left to move the
+        # turn to, while the round is still going on
+        if game.current_index is not None: raise
+
+# masked rounds queue only the subscribed outs, silent rounds none
+from pokerlib import outMask
+from pokerlib.enums import RoundPublicOutId
+
+class WinnerRound(Round):
+    public_out_mask = outMask(
+        RoundPublicOutId.DECLAREFINISHEDWINNER, RoundPublicOutId.ROUNDFINISHED)
+    private_out_mask = 0
+
+class SilentRound(Round):
+    public_out_mask = private_out_mask = 0
+
+for random_seed in range(10):
+    players, game = playRound(Round, random_seed)
+    winner_players, winner_game = playRound(WinnerRound, random_seed)
+    silent_players, silent_game = playRound(SilentRound, random_seed)
+    assert list(winner_game.public_out_queue) == [
+        out for out in game.public_out_queue
+        if out.id in (RoundPublicOutId.DECLAREFINISHEDWINNER,
+                      RoundPublicOutId.ROUNDFINISHED)
+    ]
+    assert not winner_game.private_out_queue
+    assert not silent_game.public_out_queue
+    assert not silent_game.private_out_queue
+    assert [p.money for p in players] == [p.money for p in silent_players]
+
+# showdowns of rounds with the plain parser don't build the lookup
+# tables, and subclasses can still override _showdown without arguments
+from pokerlib import _lookup
+from pokerlib.implementations import NoMuckShowdownRound
+
+# tables built by earlier tests in the same process are dropped,
+# they are built again when needed
+_lookup._rank_table = _lookup._flush_table = None
+
+class SilentNoMuckRound(NoMuckShowdownRound):
+    private_out_mask = 0
+
+players = PlayerGroup([Player(0, i, f"player{i}", 100) for i in range(3)])
+game = SilentNoMuckRound(0, players, 0, 5, 10)
+while not game.finished:
+    game.publicIn(game.current_player.id, RoundPublicInId.ALLIN)
+shown = [
+    out.data['player_id'] for out in game.public_out_queue
+    if out.id is RoundPublicOutId.PUBLICCARDSHOW
+]
+assert shown == [0, 1, 2]
+assert _lookup._rank_table is None
@@ -0,0 +1,102 @@
+import sys
+sys.path.append('../pokerlib')
+
+from random import seed, random, choice, randint
+from pokerlib import Player, PlayerGroup, Round
+from pokerlib.enums import RoundPublicInId
+from pokerlib.replay import ReplayRound
+
+class SearchRound(Round):
+    public_out_mask = 0
+    private_out_mask = 0
+
+class LazySearchRound(SearchRound):
+    lazy_hands = True
+
+def newPlayers(stacks):
+    return PlayerGroup([
+        Player(0, i, f"player{i}", money) for i, money in enumerate(stacks)])
+
+def roundState(round):
+    return (
+        round.turn, round.pot_size, list(round.board),
+        [(p.money, p.stake, p.is_folded, p.is_all_in) for p in round.players],
+        round.finished, round.closed,
+        None if round.finished else round.current_player.id
+    )
+
+def randomAction(round):
+    action = choice(round.legalActions())
+    raise_by = randint(1, 30) if action is RoundPublicInId.RAISE else 0
+    return action, raise_by
+
+def replayed(round, stacks, path):
+    game = ReplayRound(
+        round.id, newPlayers(stacks), round.button,
+        round.small_blind, round.big_blind, round._deck_cards
+    )
+    for player_id, action, raise_by in path:
+        game.publicIn(player_id, action, raise_by=raise_by)
+    return game
+
+# random walks with undos end in the same state as replaying
+# the actions that were not undone on a fresh round
+seed(7)
+for RoundClass in [SearchRound, LazySearchRound]:
+    for k in range(60):
+        stacks = [randint(20, 300) for _ in range(randint(2, 6))]
+        game = RoundClass(k, newPlayers(stacks), 0, 2, 4)
+        start = game.snapshot()
+        path = []
+        while not game.finished:
+            if path and random() < 0.3:
+                game.undo()
+                path.pop()
+            else:
+                player_id = game.current_player.id
+                action, raise_by = randomAction(game)
+                game.apply(action, raise_by)
+                path.append((player_id, action, raise_by))
+            assert roundState(game) == roundState(replayed(game, stacks, path))
+        assert game.legalActions() == []
+        while path:
+            game.undo()
+            path.pop()
+        assert game.snapshot() == start
+
+# apply and undo return to an identical snapshot
+seed(3)
+game = SearchRound(0, newPlayers([100, 150, 200]), 0, 2, 4)
+game.apply(RoundPublicInId.CALL)
+game.apply(RoundPublicInId.RAISE, 10)
+state = game.snapshot()
+for action in game.legalActions():
+    game.apply(action, 5 if action is RoundPublicInId.RAISE else 0)
+    game.undo()
+    assert game.snapshot() == state
+
+# clones are played on independently of the original
+clone = game.clone()
+clone.apply(RoundPublicInId.ALLIN)
+assert clone.snapshot() != game.snapshot()
+assert game.snapshot() == state
+clone.undo()
+assert clone.snapshot() == state
+clone.undo()
+assert clone.snapshot() != state
+assert game.snapshot() == state
+
+# illegal actions and undos with nothing applied
+game = SearchRound(0, newPlayers([100, 100]), 0, 2, 4)
+for action, raise_by in [
+    (RoundPublicInId.CHECK, 0), (RoundPublicInId.RAISE, 0),
+    (RoundPublicInId.SHOW, 0)
+]:
+    try:
+        game.apply(action, raise_by)
+        assert False
+    except ValueError: pass
+try:
+    game.undo()
+    assert False
+except ValueError: pass
@@ -0,0 +1,163 @@
+import sys
+sys.path.append('../pokerlib')
+
+import asyncio
+from pokerlib import Player, PlayerSeats
+from pokerlib.enums import (
+    RoundPublicInId, RoundPublicOutId, RoundPrivateOutId,
+    TablePublicInId, TablePublicOutId, TablePrivateOutId
+)
+from pokerlib.server import ServedTable, TableServer
+
+def newTable(table_id, nseats=2):
+    return ServedTable(table_id, PlayerSeats([None] * nseats), 100, 5, 10)
+
+async def buyin(server, table_id, player):
+    await server.send(
+        table_id, player.id, TablePublicInId.BUYIN, player=player)
+
+async def playedRound():
+    server = TableServer()
+    server.addTable(newTable(0))
+    public = server.publicEvents(0)
+    private = server.privateEvents(0, 1)
+    player1 = Player(0, 1, "player1", 100)
+    player2 = Player(0, 2, "player2", 100)
+    await buyin(server, 0, player1)
+    await buyin(server, 0, player2)
+    await server.send(0, 1, TablePublicInId.STARTROUND, round_id=0)
+    table = server.getTable(0)
+    await server.removeTable(0)
+    assert 0 not in server
+
+    events = [event async for event in public]
+    ids = [event.id for event in events]
+    assert ids[:2] == [TablePublicOutId.PLAYERJOINED] * 2
+    assert TablePublicOutId.NEWROUNDSTARTED in ids
+    assert RoundPublicOutId.SMALLBLIND in ids
+    assert all(event.player_id is None for event in events)
+    assert all(event.table_id == 0 for event in events)
+
+    events = [event async for event in private]
+    assert [event.id for event in events] == [RoundPrivateOutId.DEALTCARDS]
+    assert events[0].player_id == 1
+    assert events[0].data['cards'] == player1.cards
+    assert table.round is not None
+
+asyncio.run(playedRound())
+
+async def playedHands():
+    # many tables on one loop, each playing hands where the player to
+    # act folds and the winner mucks, driven by clients reading their
+    # public events
+    server = TableServer()
+    ntables = 500
+    for table_id in range(ntables):
+        server.addTable(newTable(table_id))
+
+    async def client(table_id):
+        public = server.publicEvents(table_id)
+        await buyin(server, table_id, Player(table_id, 1, "player1", 100))
+        await buyin(server, table_id, Player(table_id, 2, "player2", 100))
+        hands = 0
+        await server.send(table_id, 1, TablePublicInId.STARTROUND, round_id=0)
+        async for event in public:
+            if event.id is RoundPublicOutId.PLAYERACTIONREQUIRED:
+                await server.send(table_id, event.data['player_id'],
+                                  RoundPublicInId.FOLD)
+            elif event.id is RoundPublicOutId.PLAYERCHOICEREQUIRED:
+                await server.send(table_id, event.data['player_id'],
+                                  RoundPublicInId.MUCK)
+            elif event.id is RoundPublicOutId.ROUNDCLOSED:
+                hands += 1
+                if hands == 4: break
+                await server.send(table_id, 1,
+                                  TablePublicInId.STARTROUND, round_id=hands)
+        public.close()
+        return hands
+
+    hands = await asyncio.gather(*map(client, range(ntables)))
+    assert hands == [4] * ntables
+    await server.close()
+    assert len(server) == 0
+
+asyncio.run(playedHands())
+
+async def backpressure():
+    # a full stream holds up its table, which stops taking actions
+    # once its action queue is full
+    server = TableServer(queue_size=2, stream_size=1)
+    server.addTable(newTable(0, 9))
+    public = server.publicEvents(0)
+    players = [Player(0, i, f"player{i}", 100) for i in range(6)]
+    sent = 0
+    async def sendAll():
+        nonlocal sent
+        for player in players:
+            await buyin(server, 0, player)
+            sent += 1
+    sender = asyncio.create_task(sendAll())
+    await asyncio.sleep(0.05)
+    assert not sender.done() and sent < len(players)
+    assert len(public) == 1
+
+    # closing the stream releases the table
+    public.close()
+    await asyncio.wait_for(sender, 1)
+    table = await server.removeTable(0)
+    assert table.nplayers == len(players)
+
+asyncio.run(backpressure())
+
+async def misuse():
+    server = TableServer()
+    server.addTable(newTable(0))
+    try:
+        server.addTable(newTable(0))
+        assert False
+    except ValueError: pass
+    try:
+        await server.send(1, 1, TablePublicInId.STARTROUND)
+        assert False
+    except ValueError: pass
+
+    # errors are sent to the players as private events
+    private = server.privateEvents(0, 3)
+    await buyin(server, 0, Player(0, 3, "player3", 50))
+    await server.close()
+    events = [event async for event in private]
+    assert [event.id for event in events] == [TablePrivateOutId.BUYINTOOLOW]
+
+asyncio.run(misuse())
+
+async def failedActions():
+    # actions that raise are reported, and the table keeps playing
+    server = TableServer(queue_size=2)
+    server.addTable(newTable(0))
+    private = server.privateEvents(0, 1)
+    for _ in range(5):
+        await server.send(0, 1, TablePublicInId.BUYIN)
+    await buyin(server, 0, Player(0, 1, "player1", 100))
+    table = await server.removeTable(0)
+    assert table.nplayers == 1
+    events = [event async for event in private]
+    assert [event.id for event in events] == \
+        [TablePrivateOutId.ACTIONFAILED] * 5
+    assert events[0].data['action'] is TablePublicInId.BUYIN
+    assert 'KeyError' in events[0].data['error']
+
+    # tables whose task has ended can't be sent to or removed
+    server.addTable(newTable(1))
+    server._tables[1].task.cancel()
+    await asyncio.sleep(0)
+    for coroutine in [
+        server.send(1, 1, TablePublicInId.STARTROUND),
+        server.removeTable(1)
+    ]:
+        try:
+            await asyncio.wait_for(coroutine, 1)
+            assert False
+        except ValueError: pass
+    assert 1 not in server
+
+asyncio.run(failedActions())
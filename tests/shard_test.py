@@ -0,0 +1,137 @@
+import sys
+sys.path.append('../pokerlib')
+
+from pokerlib import Player, PlayerSeats
+from zlib import crc32
+from pokerlib.enums import (
+    RoundPublicInId, RoundPublicOutId,
+    TablePublicInId, TablePublicOutId, TablePrivateOutId
+)
+from pokerlib.server import ServedTable
+from pokerlib.shard import TableManager, LocalTransport, ProcessTransport
+
+def newTable(table_id):
+    table = ServedTable(table_id, PlayerSeats([None] * 2), 100, 5, 10)
+    table += Player(table_id, 1, "player1", 100)
+    table += Player(table_id, 2, "player2", 100)
+    return table
+
+def respond(manager, events, hands):
+    # the player to act folds, the winner mucks and
+    # closed rounds are followed by new ones
+    for event in events:
+        if event.id is RoundPublicOutId.PLAYERACTIONREQUIRED:
+            manager.send(event.table_id, event.data['player_id'],
+                         RoundPublicInId.FOLD)
+        elif event.id is RoundPublicOutId.PLAYERCHOICEREQUIRED:
+            manager.send(event.table_id, event.data['player_id'],
+                         RoundPublicInId.MUCK)
+        elif event.id is RoundPublicOutId.ROUNDCLOSED:
+            hands[event.table_id] += 1
+
+def startRounds(manager, table_ids, hands):
+    for table_id in table_ids:
+        manager.send(table_id, None, TablePublicInId.STARTROUND,
+                     round_id=hands[table_id])
+
+ntables = 12
+manager = TableManager(2, transport=LocalTransport)
+for table_id in range(ntables): manager.addTable(newTable(table_id))
+assert len(manager) == ntables
+# placement depends only on the table ids, so it is the same in every run
+assert all(
+    manager.shards[table_id] == crc32(repr(table_id).encode()) % 2
+    for table_id in range(ntables)
+)
+assert set(manager.shards.values()) == {0, 1}
+events = manager.poll()
+assert len(events) == 2 * ntables # players joined
+
+# actions are routed to the tables' workers
+hands = [0] * ntables
+startRounds(manager, range(ntables), hands)
+events = manager.poll()
+assert {event.table_id for event in events} == set(range(ntables))
+for transport in manager.workers.values():
+    for table in transport.worker.tables.values():
+        assert table.round is not None and table.round.id == 0
+
+# tables in a round can't be moved, the others can
+source = manager.shards[0]
+try:
+    manager.moveTable(0, 1 - source)
+    assert False
+except ValueError: pass
+while not all(hands):
+    respond(manager, events, hands)
+    events = manager.poll()
+manager.moveTable(0, 1 - source)
+assert manager.shards[0] == 1 - source
+assert 0 in manager.workers[1 - source].worker.tables
+assert 0 not in manager.workers[source].worker.tables
+
+# a new worker takes tables, and a drained one gives its tables
+# away as their rounds close
+worker_id = manager.addWorker()
+manager.moveTable(1, worker_id)
+startRounds(manager, range(ntables), hands)
+assert not manager.drainWorker(0)
+assert 0 in manager.draining and manager.workerTables(0)
+events = manager.poll()
+while any(hand < 3 for hand in hands):
+    respond(manager, events, hands)
+    closed = [
+        event.table_id for event in events
+        if event.id is RoundPublicOutId.ROUNDCLOSED
+    ]
+    startRounds(manager, [t for t in closed if hands[t] < 3], hands)
+    events = manager.poll()
+assert 0 not in manager.workers and not manager.draining
+assert set(manager.shards.values()) == {1, worker_id}
+
+# removed tables keep their players' money
+for table_id in range(ntables):
+    table = manager.removeTable(table_id)
+    assert sum(player.money for player in table) == 200
+assert len(manager) == 0
+manager.close()
+assert not manager.workers
+
+# actions that raise are reported and leave the worker running
+manager = TableManager(1, transport=LocalTransport)
+manager.addTable(newTable(0))
+manager.poll()
+manager.send(0, 3, TablePublicInId.BUYIN)
+events = manager.poll()
+assert [event.id for event in events] == [TablePrivateOutId.ACTIONFAILED]
+assert events[0].player_id == 3 and 'KeyError' in events[0].data['error']
+manager.send(0, 1, TablePublicInId.LEAVETABLE)
+assert [event.id for event in manager.poll()] == [
+    TablePublicOutId.PLAYERREMOVED]
+manager.close()
+
+# the same with workers in child processes
+manager = TableManager(2)
+for table_id in range(4): manager.addTable(newTable(table_id))
+assert isinstance(manager.workers[0], ProcessTransport)
+hands = [0] * 4
+startRounds(manager, range(4), hands)
+while not all(hands):
+    respond(manager, manager.poll(1), hands)
+manager.moveTable(0, 1 - manager.shards[0])
+assert manager.drainWorker(0)
+assert set(manager.shards.values()) == {1}
+table = manager.removeTable(3)
+assert sum(player.money for player in table) == 200
+manager.send(1, 3, TablePublicInId.BUYIN)
+manager.send(1, None, TablePublicInId.STARTROUND, round_id=hands[1])
+ids = [event.id for event in manager.poll(1)]
+while TablePublicOutId.NEWROUNDSTARTED not in ids:
+    ids += [event.id for event in manager.poll(1)]
+assert ids[0] is TablePrivateOutId.ACTIONFAILED
+manager.close()
+
+try:
+    TableManager(1, transport=LocalTransport).drainWorker(0)
+    assert False
+except ValueError: pass
@@ -0,0 +1,53 @@
+import sys
+sys.path.append('../pokerlib')
+
+import random
+from random import Random
+from pokerlib import Player, PlayerGroup, Round
+from pokerlib.sim import Simulator, passivePolicy, randomPolicy
+
+class CompactRound(Round):
+    compact_cards = True
+
+# with the same deck and decisions, rounds end as they do in Round
+def roundWinnings(random_seed, policies, stack, button):
+    random.seed(random_seed)
+    players = PlayerGroup([
+        Player(0, i, f"player{i}", stack) for i in range(len(policies))])
+    game = CompactRound(0, players, button, 5, 10)
+    while not game.finished:
+        player = game.current_player
+        action = policies[player.id](game, player.id)
+        if isinstance(action, tuple):
+            game.publicIn(player.id, action[0], raise_by=action[1])
+        else: game.publicIn(player.id, action)
+    return [player.money - stack for player in players]
+
+for random_seed in range(200):
+    n = 2 + random_seed % 8
+    button = random_seed % n
+    policies = [randomPolicy(20, Random(10 * random_seed + i)) for i in range(n)]
+    sim = Simulator(policies, 100000, 5, 10, seed=random_seed)
+    sim.button = button
+    won = sim.playHand()
+    policies = [randomPolicy(20, Random(10 * random_seed + i)) for i in range(n)]
+    assert won == roundWinnings(random_seed, policies, 100000, button)
+
+# chips are only moved between seats, also with side pots
+sim = Simulator([randomPolicy(rng=Random(i)) for i in range(6)], 200, seed=0)
+for _ in range(500):
+    won = sim.playHand()
+    assert sum(won) == 0
+    assert all(stack >= 0 for stack in sim.stacks)
+stats = sim.run(500)
+assert stats.hands == 1000 and sum(stats.winnings) == 0
+assert stats.winnings == sim.winnings and stats.hands_per_second > 0
+
+# checking or calling players all reach the river
+sim = Simulator([passivePolicy] * 4, seed=1)
+sim.playHand()
+assert len(sim.board) == 5 and sim.pot == 40
+
+try: Simulator([passivePolicy])
+except ValueError: pass
+else: assert False